@@ -0,0 +1,168 @@
+"""Fixtures for the LumaFlow microbenchmarks.
+
+The benchmarks run LumaFlow's own code against a small local stand-in for
+``hass`` instead of a full Home Assistant instance. Light service calls
+are only counted, so results measure LumaFlow's overhead rather than
+device I/O.
+"""
+
+import asyncio
+import itertools
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+# Import the integration from this checkout
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.lumaflow.coordinator import LumaFlowCoordinator  # noqa: E402
+from custom_components.lumaflow.light import LumaFlowLight  # noqa: E402
+
+LIGHT_COUNTS = [10, 100, 1000]
+GROUP_COUNTS = [1, 10, 100]
+LIGHTS_PER_GROUP = 10
+
+
+class FakeServices:
+    """Service registry that records calls instead of running them."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.calls = 0
+        self.handlers: Dict[Tuple[str, str], Callable] = {}
+
+    async def async_call(self, domain: str, service: str, service_data: Optional[Dict] = None, **kwargs: Any) -> None:
+        """Count a service call."""
+        self.calls += 1
+
+    def async_register(self, domain: str, service: str, handler: Callable, schema: Any = None) -> None:
+        """Remember a service handler so benchmarks can call it directly."""
+        self.handlers[(domain, service)] = handler
+
+    def has_service(self, domain: str, service: str) -> bool:
+        """Return True if a handler is registered."""
+        return (domain, service) in self.handlers
+
+
+class FakeStates:
+    """Minimal state machine."""
+
+    def __init__(self) -> None:
+        """Initialize the state machine."""
+        self._states: Dict[str, State] = {}
+
+    def get(self, entity_id: str) -> Optional[State]:
+        """Return the state of an entity."""
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id: str, state: str, attributes: Optional[Dict] = None) -> None:
+        """Set the state of an entity."""
+        self._states[entity_id] = State(entity_id, state, attributes or {})
+
+
+class FakeHass:
+    """The parts of HomeAssistant that LumaFlow touches."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize the stand-in."""
+        self.loop = loop
+        self.data: Dict[str, Any] = {}
+        self.services = FakeServices()
+        self.states = FakeStates()
+        self.config = SimpleNamespace(latitude=51.48, longitude=0.0, time_zone="UTC")
+
+    def async_create_task(self, target: Any, *args: Any, **kwargs: Any) -> asyncio.Task:
+        """Schedule a coroutine on the loop."""
+        return self.loop.create_task(target)
+
+
+class FakeConfigEntry:
+    """Config entry holding a group's settings."""
+
+    domain = "lumaflow"
+
+    def __init__(self, entry_id: str, data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize the entry."""
+        self.entry_id = entry_id
+        self.title = data["group_name"]
+        self.data = data
+        self.options = options or {}
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        """Accept and ignore an options listener."""
+        return lambda: None
+
+    def async_on_unload(self, func: Callable) -> None:
+        """Accept and ignore an unload callback."""
+
+
+@pytest.fixture
+def event_loop_bench():
+    """Event loop the benchmarks drive by hand."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def hass(event_loop_bench: asyncio.AbstractEventLoop) -> FakeHass:
+    """Return a fresh hass stand-in."""
+    return FakeHass(event_loop_bench)
+
+
+@pytest.fixture
+def make_group(hass: FakeHass) -> Callable[..., Tuple[LumaFlowCoordinator, FakeConfigEntry]]:
+    """Return a factory creating a group of lights that are all on."""
+    counter = iter(range(10**6))
+
+    def _make_group(
+        light_count: int,
+        options: Optional[Dict[str, Any]] = None,
+        color_modes: Sequence[List[str]] = (["color_temp"],),
+    ) -> Tuple[LumaFlowCoordinator, FakeConfigEntry]:
+        index = next(counter)
+        lights: List[str] = [f"light.bench_{index}_{light}" for light in range(light_count)]
+        # Members cycle through the given color mode lists
+        for light_id, modes in zip(lights, itertools.cycle(color_modes)):
+            hass.states.async_set(light_id, "on", {"supported_color_modes": modes})
+
+        entry = FakeConfigEntry(
+            f"entry_{index}",
+            {
+                "group_name": f"bench_{index}",
+                "lights": lights,
+                "sunset_offset": 0,
+                "transition_speed": "moderate",
+                "min_brightness": 1,
+                "max_brightness": 100,
+                "min_color_temp": 2700,
+                "max_color_temp": 6500,
+            },
+            options,
+        )
+        coordinator = LumaFlowCoordinator(hass, entry)
+        coordinator.data = coordinator.calculate_data(dt_util.utcnow())
+        coordinator.async_sync_light_states()
+        hass.data.setdefault("lumaflow", {})[entry.entry_id] = coordinator
+        return coordinator, entry
+
+    return _make_group
+
+
+@pytest.fixture
+def make_light(hass: FakeHass) -> Callable[[LumaFlowCoordinator, FakeConfigEntry], LumaFlowLight]:
+    """Return a factory creating the group light entity of a group."""
+
+    def _make_light(coordinator: LumaFlowCoordinator, entry: FakeConfigEntry) -> LumaFlowLight:
+        light = LumaFlowLight(coordinator, entry, entry.data["group_name"], entry.data["lights"])
+        light.hass = hass
+        light.entity_id = f"light.{entry.data['group_name']}_lumaflow"
+        coordinator.light_entity = light
+        return light
+
+    return _make_light
@@ -0,0 +1,61 @@
+"""Benchmarks for lighting curve and phase evaluation."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.lumaflow.const import CURVE_SHAPES
+from custom_components.lumaflow.solar import get_sun_times
+
+
+def test_calculate_data(benchmark, make_group):
+    """Full coordinator update for one group, with a warm day curve."""
+    coordinator, _ = make_group(10)
+    now = dt_util.utcnow()
+    benchmark(coordinator.calculate_data, now)
+
+
+@pytest.mark.parametrize("shape", CURVE_SHAPES)
+def test_day_curve_cold(benchmark, make_group, shape):
+    """Sample a whole day of the curve at one-minute resolution."""
+    coordinator, _ = make_group(10, {"curve_shape": shape, "morning_ramp": 60})
+    day = dt_util.utcnow().date()
+
+    def _compute():
+        coordinator._day_curves.clear()
+        return coordinator.get_day_curve(day)
+
+    benchmark(_compute)
+
+
+def test_curve_year_range(benchmark, make_group):
+    """Sample a year of the curve at five-minute resolution in one pass."""
+    coordinator, _ = make_group(10)
+    start = dt_util.utcnow()
+    benchmark(coordinator.calculate_curve, start, start + timedelta(days=365), timedelta(minutes=5))
+
+
+def test_lighting_values_at(benchmark, make_group):
+    """Look up the values at one instant from the cached day curve."""
+    coordinator, _ = make_group(10)
+    now = dt_util.utcnow()
+    benchmark(coordinator.lighting_values_at, now)
+
+
+def test_next_update(benchmark, make_group):
+    """Find the next point where the phase or integer values change."""
+    coordinator, _ = make_group(10)
+    now = dt_util.utcnow()
+    sun_times = get_sun_times(coordinator.location.latitude, coordinator.location.longitude, now.date())
+    sunset_adjusted = sun_times["sunset"] + timedelta(minutes=coordinator.sunset_offset)
+    benchmark(coordinator._calculate_next_update, now, sun_times, sunset_adjusted)
+
+
+def test_current_phase(benchmark, make_group):
+    """Classify an instant into a circadian phase."""
+    coordinator, _ = make_group(10)
+    now = dt_util.utcnow()
+    sun_times = get_sun_times(coordinator.location.latitude, coordinator.location.longitude, now.date())
+    sunset_adjusted = sun_times["sunset"] + timedelta(minutes=coordinator.sunset_offset)
+    benchmark(coordinator._calculate_current_phase, now, sun_times, sunset_adjusted)
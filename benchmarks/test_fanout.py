@@ -0,0 +1,152 @@
+"""Benchmarks for enabled-light resolution and turn_on fan-out."""
+
+import pytest
+from homeassistant.components.light import ColorMode
+
+from conftest import LIGHT_COUNTS
+from custom_components.lumaflow.const import DATA_PENDING, DATA_THROTTLE, PLATFORM_COMMAND_RATES
+from custom_components.lumaflow.pending import PendingCommands
+from custom_components.lumaflow.throttle import CommandThrottle
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_enabled_lights(benchmark, make_group, make_light, light_count):
+    """Resolve the lights a group should command."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+    # Disable every tenth light so the filter has work to do
+    coordinator.enabled_lights.difference_update(entry.data["lights"][::10])
+    benchmark(light._get_enabled_lights)
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_turn_on_fanout(benchmark, hass, event_loop_bench, make_group, make_light, light_count):
+    """Turn a group on with circadian values that differ from the lights."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+
+    def _forget_applied():
+        for light_id in entry.data["lights"]:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(light.async_turn_on()),
+        setup=_forget_applied,
+        rounds=50,
+        warmup_rounds=2,
+    )
+    assert hass.services.calls
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_turn_on_fanout_throttled(benchmark, hass, event_loop_bench, make_group, make_light, monkeypatch, light_count):
+    """Turn a group on through the pending command slots and a rate limit that never waits."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+    hass.data["lumaflow"][DATA_PENDING] = PendingCommands(hass)
+    throttle = hass.data["lumaflow"][DATA_THROTTLE] = CommandThrottle(hass)
+    monkeypatch.setattr(throttle, "platform_for", lambda entity_id: "bench")
+    monkeypatch.setitem(PLATFORM_COMMAND_RATES, "bench", 10**9)
+
+    def _forget_applied():
+        for light_id in entry.data["lights"]:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(light.async_turn_on()),
+        setup=_forget_applied,
+        rounds=50,
+        warmup_rounds=2,
+    )
+    assert coordinator.metrics.queue_wait.total
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_turn_on_mixed_capabilities(benchmark, hass, event_loop_bench, make_group, make_light, light_count):
+    """Turn on a group of color temperature, RGB and brightness-only lights, one call per bucket."""
+    coordinator, entry = make_group(light_count, color_modes=(["color_temp"], ["rgb"], ["brightness"]))
+    light = make_light(coordinator, entry)
+
+    def _forget_applied():
+        for light_id in entry.data["lights"]:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(light.async_turn_on()),
+        setup=_forget_applied,
+        rounds=50,
+        warmup_rounds=2,
+    )
+
+    # One call per bucket, however often the benchmark ran
+    _forget_applied()
+    calls = hass.services.calls
+    event_loop_bench.run_until_complete(light.async_turn_on())
+    assert hass.services.calls - calls == 3
+
+
+def test_mixed_group_color_modes(make_group):
+    """Report only the color mode of a mixed group, never brightness alongside it."""
+    coordinator, _ = make_group(10, color_modes=(["color_temp"], ["brightness"]))
+    assert coordinator.capabilities.supported_color_modes == {ColorMode.COLOR_TEMP}
+    assert coordinator.capabilities.color_mode == ColorMode.COLOR_TEMP
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_turn_on_half_unavailable(benchmark, hass, event_loop_bench, make_group, make_light, light_count):
+    """Turn on a group where every other light is unavailable and skipped without a call."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+    for light_id in entry.data["lights"][::2]:
+        hass.states.async_set(light_id, "unavailable")
+    coordinator.async_sync_light_states()
+
+    def _forget_applied():
+        for light_id in entry.data["lights"]:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(light.async_turn_on()),
+        setup=_forget_applied,
+        rounds=50,
+        warmup_rounds=2,
+    )
+
+    # Every unavailable light is skipped on each turn_on
+    _forget_applied()
+    skipped = coordinator.metrics.skipped.total
+    event_loop_bench.run_until_complete(light.async_turn_on())
+    assert coordinator.metrics.skipped.total - skipped == len(entry.data["lights"][::2])
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_turn_on_unchanged(benchmark, hass, event_loop_bench, make_group, make_light, light_count):
+    """Turn a group on when every light already has the circadian values."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+    event_loop_bench.run_until_complete(light.async_turn_on())
+    calls = hass.services.calls
+
+    benchmark(lambda: event_loop_bench.run_until_complete(light.async_turn_on()))
+    assert hass.services.calls == calls
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_dispatch_distinct_payloads(benchmark, event_loop_bench, make_group, light_count):
+    """Dispatch a different payload to every light, one service call each."""
+    coordinator, entry = make_group(light_count)
+    calls = {
+        light_id: {"brightness_pct": index % 100 + 1}
+        for index, light_id in enumerate(entry.data["lights"])
+    }
+
+    def _forget_applied():
+        for light_id in calls:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(coordinator.dispatcher.async_dispatch("turn_on", calls)),
+        setup=_forget_applied,
+        rounds=50,
+        warmup_rounds=2,
+    )
@@ -0,0 +1,26 @@
+"""Benchmarks for driving many groups from the shared scheduler."""
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.lumaflow.scheduler import LumaFlowScheduler
+
+from conftest import GROUP_COUNTS, LIGHTS_PER_GROUP
+
+
+@pytest.mark.parametrize("group_count", GROUP_COUNTS)
+def test_scheduler_tick(benchmark, hass, make_group, group_count):
+    """Evaluate every group in one scheduler pass."""
+    coordinators = [make_group(LIGHTS_PER_GROUP)[0] for _ in range(group_count)]
+    scheduler = LumaFlowScheduler(hass)
+    for coordinator in coordinators:
+        scheduler.async_add_group(coordinator)
+
+    def _make_due():
+        for coordinator in coordinators:
+            coordinator.next_update = None
+
+    benchmark.pedantic(
+        scheduler._async_tick, args=(dt_util.utcnow(),), setup=_make_due, rounds=200, warmup_rounds=5
+    )
+    scheduler.async_stop()
@@ -0,0 +1,62 @@
+"""Benchmarks for manual override detection on member light state changes."""
+
+import pytest
+from homeassistant.components.light import LightEntityFeature
+from homeassistant.core import Context, Event, State
+
+from conftest import LIGHT_COUNTS
+
+
+def _support_transitions(hass, coordinator, light_ids):
+    """Let lights advertise transition support, so LumaFlow fades them."""
+    for light_id in light_ids:
+        attributes = hass.states.get(light_id).attributes
+        hass.states.async_set(light_id, "on", {**attributes, "supported_features": LightEntityFeature.TRANSITION})
+    coordinator.async_sync_light_states()
+
+
+def _state_changes(hass, light_ids, brightness):
+    """Return state change events reporting a brightness, as a light's integration would."""
+    events = []
+    for light_id in light_ids:
+        old_state = hass.states.get(light_id)
+        new_state = State(light_id, "on", {**old_state.attributes, "brightness": brightness})
+        # Reports arrive in a context of their own, not the one of the command
+        events.append(
+            Event("state_changed", {"entity_id": light_id, "old_state": old_state, "new_state": new_state}, context=Context())
+        )
+    return events
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_reports_during_transition(benchmark, hass, event_loop_bench, make_group, make_light, light_count):
+    """Handle intermediate reports of lights fading to the circadian values, without marking overrides."""
+    coordinator, entry = make_group(light_count)
+    light = make_light(coordinator, entry)
+    lights = entry.data["lights"]
+    _support_transitions(hass, coordinator, lights)
+    event_loop_bench.run_until_complete(light.async_turn_on())
+    events = _state_changes(hass, lights, 3)
+
+    def _handle_all():
+        for event in events:
+            coordinator.async_handle_light_state(event)
+
+    benchmark(_handle_all)
+    assert not coordinator.overridden_lights
+    # The final values are still recognised as LumaFlow's own once the transition ends
+    assert all(coordinator.dispatcher.applied_states.get(light_id) is not None for light_id in lights)
+
+
+def test_reports_after_transition(hass, event_loop_bench, make_group, make_light):
+    """Mark a light overridden for a change reported once its transition has ended."""
+    coordinator, entry = make_group(10)
+    light = make_light(coordinator, entry)
+    _support_transitions(hass, coordinator, entry.data["lights"])
+    event_loop_bench.run_until_complete(light.async_turn_on())
+    applied_states = coordinator.dispatcher.applied_states
+    light_id = entry.data["lights"][0]
+    applied_states._transitions[light_id] = 0.0
+
+    coordinator.async_handle_light_state(_state_changes(hass, [light_id], 3)[0])
+    assert coordinator.overridden_lights == {light_id}
@@ -0,0 +1,70 @@
+"""Benchmarks for the LumaFlow service handlers."""
+
+import pytest
+from homeassistant.core import ServiceCall
+
+from custom_components.lumaflow.const import (
+    DATA_TRACKER,
+    DOMAIN,
+    SERVICE_OVERRIDE_LIGHTS,
+    SERVICE_RESTORE_LIGHTS,
+)
+from custom_components.lumaflow.services import async_setup_services
+from custom_components.lumaflow.tracker import LumaFlowStateTracker
+
+from conftest import LIGHT_COUNTS
+
+
+@pytest.fixture
+def services(hass):
+    """Register the LumaFlow services on the stand-in."""
+    hass.data.setdefault(DOMAIN, {})[DATA_TRACKER] = LumaFlowStateTracker(hass)
+    async_setup_services(hass)
+    return hass.services.handlers
+
+
+def _index(hass, coordinator):
+    """Index a group in the tracker without subscribing to state changes."""
+    tracker = hass.data[DOMAIN][DATA_TRACKER]
+    for light_id in coordinator.controlled_lights:
+        tracker._index.setdefault(light_id, []).append(coordinator)
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_restore_member_lights(benchmark, hass, event_loop_bench, services, make_group, make_light, light_count):
+    """Restore every overridden member light of a group."""
+    coordinator, entry = make_group(light_count)
+    make_light(coordinator, entry)
+    _index(hass, coordinator)
+    lights = entry.data["lights"]
+    handler = services[(DOMAIN, SERVICE_RESTORE_LIGHTS)]
+    call = ServiceCall(DOMAIN, SERVICE_RESTORE_LIGHTS, {"lights": lights})
+
+    def _override_all():
+        coordinator.overridden_lights.update(lights)
+        for light_id in lights:
+            coordinator.dispatcher.applied_states.invalidate(light_id)
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(handler(call)),
+        setup=_override_all,
+        rounds=20,
+        warmup_rounds=1,
+    )
+    assert not coordinator.overridden_lights
+
+
+@pytest.mark.parametrize("light_count", LIGHT_COUNTS)
+def test_override_member_lights(benchmark, hass, event_loop_bench, services, make_group, light_count):
+    """Override every member light of a group."""
+    coordinator, entry = make_group(light_count)
+    _index(hass, coordinator)
+    handler = services[(DOMAIN, SERVICE_OVERRIDE_LIGHTS)]
+    call = ServiceCall(DOMAIN, SERVICE_OVERRIDE_LIGHTS, {"lights": entry.data["lights"], "brightness": 40})
+
+    benchmark.pedantic(
+        lambda: event_loop_bench.run_until_complete(handler(call)),
+        rounds=20,
+        warmup_rounds=1,
+    )
+    assert coordinator.overridden_lights == set(entry.data["lights"])
@@ -0,0 +1,20 @@
+"""Benchmarks for the offline schedule simulator."""
+
+from datetime import date
+
+import pytest
+
+from custom_components.lumaflow.simulator import simulate
+
+LOCATIONS = {
+    "london": (51.48, -0.12, "Europe/London"),
+    "tromso": (69.65, 18.96, "Europe/Oslo"),
+}
+
+
+@pytest.mark.parametrize("location", LOCATIONS)
+def test_simulate_year(benchmark, location):
+    """Simulate a year of one group at one-minute resolution, with a morning ramp."""
+    latitude, longitude, time_zone = LOCATIONS[location]
+    result = benchmark(simulate, latitude, longitude, time_zone, date(2026, 1, 1), 365, morning_ramp=60)
+    assert result.minutes == 365 * 1440
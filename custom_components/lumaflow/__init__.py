@@ -1,35 +1,78 @@
 """LumaFlow - Circadian Rhythm Lighting Integration for Home Assistant."""
 
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, PLATFORMS
-from .coordinator import LumaFlowCoordinator
+from .const import (
+    CONF_RESTORE_ON_STARTUP,
+    DATA_PENDING,
+    DATA_RECONCILER,
+    DATA_SCHEDULER,
+    DATA_STORE,
+    DATA_THROTTLE,
+    DATA_TRACKER,
+    DEFAULT_RESTORE_ON_STARTUP,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_ENABLE,
+)
+from .coordinator import LumaFlowCoordinator, async_get_coordinators
+from .pending import PendingCommands
+from .reconcile import StartupReconciler
+from .scheduler import LumaFlowScheduler
 from .services import async_setup_services, async_unload_services
+from .storage import LumaFlowStore
+from .throttle import CommandThrottle
+from .tracker import LumaFlowStateTracker
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(minutes=1)
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up LumaFlow from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     
+    # Runtime state of every group, read once before any entities are added
+    if DATA_STORE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_STORE] = LumaFlowStore(hass)
+    store: LumaFlowStore = hass.data[DOMAIN][DATA_STORE]
+    await store.async_load()
+    
     coordinator = LumaFlowCoordinator(hass, entry)
+    if entry.options.get(CONF_RESTORE_ON_STARTUP, entry.data.get(CONF_RESTORE_ON_STARTUP, DEFAULT_RESTORE_ON_STARTUP)):
+        coordinator.async_restore_state(store.get(entry.entry_id))
     await coordinator.async_config_entry_first_refresh()
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
+    # One state subscription shared by every group
+    if DATA_TRACKER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_TRACKER] = LumaFlowStateTracker(hass)
+    hass.data[DOMAIN][DATA_TRACKER].async_add_group(coordinator)
+    
+    # One clock shared by every group
+    if DATA_SCHEDULER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_SCHEDULER] = LumaFlowScheduler(hass)
+    hass.data[DOMAIN][DATA_SCHEDULER].async_add_group(coordinator)
+    
+    # One command rate limit and one pending command per light, shared by every group
+    if DATA_THROTTLE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_THROTTLE] = CommandThrottle(hass)
+        hass.data[DOMAIN][DATA_PENDING] = PendingCommands(hass)
+    
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # Bring the lights up to date in waves once Home Assistant has started
+    if DATA_RECONCILER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_RECONCILER] = StartupReconciler(hass)
+    hass.data[DOMAIN][DATA_RECONCILER].async_add_group(coordinator)
+    
     # Set up services (only once for all entries)
-    if len(hass.data[DOMAIN]) == 1:
+    if not hass.services.has_service(DOMAIN, SERVICE_ENABLE):
         async_setup_services(hass)
     
     return True
@@ -40,16 +83,37 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        tracker: LumaFlowStateTracker = hass.data[DOMAIN][DATA_TRACKER]
+        tracker.async_remove_group(coordinator)
+        scheduler: LumaFlowScheduler = hass.data[DOMAIN][DATA_SCHEDULER]
+        scheduler.async_remove_group(coordinator)
+        reconciler: StartupReconciler = hass.data[DOMAIN][DATA_RECONCILER]
+        reconciler.async_remove_group(coordinator)
         
-        # Unload services when last entry is removed
-        if not hass.data[DOMAIN]:
+        # Unload services and domain-wide objects when last entry is removed
+        if not async_get_coordinators(hass):
+            tracker.async_stop()
+            scheduler.async_stop()
+            reconciler.async_stop()
+            hass.data[DOMAIN][DATA_THROTTLE].async_stop()
+            # Write pending changes before the store goes away
+            await hass.data[DOMAIN][DATA_STORE].async_flush()
+            hass.data.pop(DOMAIN)
             async_unload_services(hass)
     
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the stored runtime state of a removed entry."""
+    store: LumaFlowStore = hass.data.get(DOMAIN, {}).get(DATA_STORE) or LumaFlowStore(hass)
+    await store.async_load()
+    store.async_remove(entry.entry_id)
+    await store.async_flush()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry) 
\ No newline at end of file
+    await async_setup_entry(hass, entry)
@@ -0,0 +1,234 @@
+"""Per-light cache of the values LumaFlow last applied."""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_BRIGHTNESS_PCT,
+    ATTR_COLOR_MODE,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
+    ATTR_XY_COLOR,
+    ColorMode,
+)
+from homeassistant.core import State
+from homeassistant.util import color as color_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Attributes that carry no device state of their own
+_NON_STATE_ATTRIBUTES = {"transition"}
+
+# Color payload attributes and the color mode each one sets
+_COLOR_ATTRIBUTES = ((ATTR_RGB_COLOR, ColorMode.RGB), (ATTR_XY_COLOR, ColorMode.XY))
+
+# Allowed difference between applied and reported colors, per component
+_RGB_TOLERANCE = 3
+_XY_TOLERANCE = 0.005
+
+
+class AppliedState:
+    """Last brightness and color LumaFlow sent to a single light."""
+
+    __slots__ = ("brightness", "kelvin", "color", "color_mode", "timestamp")
+
+    def __init__(
+        self,
+        brightness: Optional[int],
+        kelvin: Optional[int],
+        color: Optional[Tuple[float, ...]],
+        color_mode: Optional[str],
+        timestamp: float,
+    ) -> None:
+        """Initialize the applied state."""
+        self.brightness = brightness
+        self.kelvin = kelvin
+        self.color = color
+        self.color_mode = color_mode
+        self.timestamp = timestamp
+
+
+def quantize_brightness(data: Dict[str, Any]) -> Optional[int]:
+    """Return the 0-255 brightness a payload resolves to on the device."""
+    if ATTR_BRIGHTNESS in data:
+        return int(data[ATTR_BRIGHTNESS])
+    if ATTR_BRIGHTNESS_PCT in data:
+        # Same conversion Home Assistant applies before calling the light
+        return round(255 * data[ATTR_BRIGHTNESS_PCT] / 100)
+    return None
+
+
+def quantize_kelvin(kelvin: Optional[float]) -> Optional[int]:
+    """Return the mired step a color temperature resolves to on the device."""
+    if not kelvin:
+        return None
+    return color_util.color_temperature_kelvin_to_mired(kelvin)
+
+
+class AppliedStateCache:
+    """Track what was last applied to each light and suppress no-op commands.
+
+    While a light is still transitioning to applied values, the states it
+    reports on the way are expected and leave the cache alone.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._states: Dict[str, AppliedState] = {}
+        self._transitions: Dict[str, float] = {}
+
+    def get(self, light_id: str) -> Optional[AppliedState]:
+        """Return the last applied state for a light."""
+        return self._states.get(light_id)
+
+    def diff(self, light_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Strip attributes whose device-level value is unchanged.
+
+        Returns the reduced payload, or None if nothing would change.
+        """
+        applied = self._states.get(light_id)
+        if applied is None:
+            return data
+
+        changed = dict(data)
+        brightness = quantize_brightness(data)
+        if brightness is not None and brightness == applied.brightness:
+            changed.pop(ATTR_BRIGHTNESS, None)
+            changed.pop(ATTR_BRIGHTNESS_PCT, None)
+
+        kelvin = data.get(ATTR_COLOR_TEMP_KELVIN)
+        if (
+            kelvin is not None
+            and applied.color_mode == ColorMode.COLOR_TEMP
+            and quantize_kelvin(kelvin) == quantize_kelvin(applied.kelvin)
+        ):
+            changed.pop(ATTR_COLOR_TEMP_KELVIN)
+
+        # Table colors are already quantized, so equal payloads mean equal output
+        for attr, mode in _COLOR_ATTRIBUTES:
+            color = data.get(attr)
+            if color is not None and applied.color_mode == mode and tuple(color) == applied.color:
+                changed.pop(attr)
+
+        if not set(changed) - _NON_STATE_ATTRIBUTES:
+            return None
+        return changed
+
+    def record(self, light_ids: Iterable[str], data: Dict[str, Any]) -> None:
+        """Remember a payload that was successfully applied to lights."""
+        brightness = quantize_brightness(data)
+        kelvin, color, color_mode = _applied_color(data)
+        timestamp = time.time()
+        transition = data.get(ATTR_TRANSITION)
+        deadline = time.monotonic() + transition if transition else None
+
+        for light_id in light_ids:
+            if deadline is not None:
+                self._transitions[light_id] = deadline
+            else:
+                self._transitions.pop(light_id, None)
+
+            applied = self._states.get(light_id)
+            if applied is None:
+                self._states[light_id] = AppliedState(brightness, kelvin, color, color_mode, timestamp)
+                continue
+
+            # Keep attributes the payload did not touch
+            if brightness is not None:
+                applied.brightness = brightness
+            if color_mode is not None or _touches_color(data):
+                applied.kelvin = kelvin
+                applied.color = color
+                applied.color_mode = color_mode
+            applied.timestamp = timestamp
+
+    def invalidate(self, light_id: str) -> None:
+        """Forget what was applied to a light."""
+        self._states.pop(light_id, None)
+        self._transitions.pop(light_id, None)
+
+    def in_transition(self, light_id: str, now: Optional[float] = None) -> bool:
+        """Return True if a light may still be transitioning to the values last applied."""
+        deadline = self._transitions.get(light_id)
+        if deadline is None:
+            return False
+        if (time.monotonic() if now is None else now) < deadline:
+            return True
+        del self._transitions[light_id]
+        return False
+
+    def matches(self, light_id: str, state: State) -> bool:
+        """Return True if a light reports the values last applied to it."""
+        applied = self._states.get(light_id)
+        return applied is not None and state.state == "on" and not _state_differs(applied, state)
+
+    def handle_state(self, light_id: str, new_state: Optional[State]) -> None:
+        """Invalidate a light whose reported state no longer matches the cache."""
+        applied = self._states.get(light_id)
+        if applied is None:
+            return
+
+        if new_state is None or new_state.state != "on":
+            self.invalidate(light_id)
+            return
+
+        # Intermediate values on the way to the applied ones
+        if self.in_transition(light_id):
+            return
+
+        if _state_differs(applied, new_state):
+            _LOGGER.debug("Invalidating applied state for %s after external change", light_id)
+            self.invalidate(light_id)
+
+
+def _applied_color(
+    data: Dict[str, Any]
+) -> Tuple[Optional[int], Optional[Tuple[float, ...]], Optional[str]]:
+    """Return the kelvin, color and color mode a payload sets, if any."""
+    kelvin = data.get(ATTR_COLOR_TEMP_KELVIN)
+    if kelvin is not None:
+        return kelvin, None, ColorMode.COLOR_TEMP
+    for attr, mode in _COLOR_ATTRIBUTES:
+        if data.get(attr) is not None:
+            return None, tuple(data[attr]), mode
+    return None, None, None
+
+
+def _touches_color(data: Dict[str, Any]) -> bool:
+    """Return True if a payload sets any color attribute."""
+    return any(key.endswith("_color") or key.startswith("color_temp") for key in data)
+
+
+def _state_differs(applied: AppliedState, state: State) -> bool:
+    """Return True if a light reports values other than those applied."""
+    brightness = state.attributes.get(ATTR_BRIGHTNESS)
+    if applied.brightness is not None and not _close(brightness, applied.brightness):
+        return True
+
+    if applied.color_mode == ColorMode.COLOR_TEMP:
+        if state.attributes.get(ATTR_COLOR_MODE) != ColorMode.COLOR_TEMP:
+            return True
+        reported = quantize_kelvin(state.attributes.get(ATTR_COLOR_TEMP_KELVIN))
+        if not _close(reported, quantize_kelvin(applied.kelvin)):
+            return True
+
+    for attr, mode in _COLOR_ATTRIBUTES:
+        if applied.color_mode == mode:
+            tolerance = _RGB_TOLERANCE if mode == ColorMode.RGB else _XY_TOLERANCE
+            reported = state.attributes.get(attr)
+            if reported is None or any(
+                not _close(value, expected, tolerance) for value, expected in zip(reported, applied.color)
+            ):
+                return True
+
+    return False
+
+
+def _close(reported: Optional[float], expected: Optional[float], tolerance: float = 1) -> bool:
+    """Compare device values, allowing for rounding on the device side."""
+    if reported is None or expected is None:
+        return reported == expected
+    return abs(reported - expected) <= tolerance
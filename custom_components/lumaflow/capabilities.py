@@ -0,0 +1,190 @@
+"""Per-light cache of the capabilities of lights controlled by LumaFlow."""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from homeassistant.components.light import (
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ColorMode,
+    LightEntityFeature,
+)
+from homeassistant.const import ATTR_SUPPORTED_FEATURES
+from homeassistant.core import State
+
+_LOGGER = logging.getLogger(__name__)
+
+# Member light color modes and the group color mode each one provides
+_GROUP_COLOR_MODES = {
+    ColorMode.COLOR_TEMP: ColorMode.COLOR_TEMP,
+    ColorMode.RGB: ColorMode.RGB,
+    ColorMode.RGBW: ColorMode.RGB,
+    ColorMode.RGBWW: ColorMode.RGB,
+    ColorMode.XY: ColorMode.XY,
+    ColorMode.HS: ColorMode.XY,
+    ColorMode.BRIGHTNESS: ColorMode.BRIGHTNESS,
+    ColorMode.WHITE: ColorMode.BRIGHTNESS,
+    ColorMode.ONOFF: ColorMode.ONOFF,
+}
+
+# Group color modes in order of preference for circadian lighting
+_PREFERRED_COLOR_MODES = (
+    ColorMode.COLOR_TEMP, ColorMode.RGB, ColorMode.XY, ColorMode.BRIGHTNESS, ColorMode.ONOFF
+)
+
+# Command shape of a light: color mode, transition support and color temperature range
+Bucket = Tuple[ColorMode, bool, Optional[int], Optional[int]]
+
+
+def _preferred_color_mode(modes: Iterable[ColorMode]) -> ColorMode:
+    """Return the color mode to use for circadian lighting out of a set of modes."""
+    return next((mode for mode in _PREFERRED_COLOR_MODES if mode in modes), ColorMode.BRIGHTNESS)
+
+
+class LightCapabilities:
+    """What a single member light can do, as reported in its state."""
+
+    __slots__ = ("color_modes", "color_mode", "min_kelvin", "max_kelvin", "supports_transition")
+
+    def __init__(
+        self,
+        color_modes: FrozenSet[ColorMode],
+        min_kelvin: Optional[int],
+        max_kelvin: Optional[int],
+        supports_transition: bool,
+    ) -> None:
+        """Initialize the capabilities."""
+        self.color_modes = color_modes
+        self.color_mode = _preferred_color_mode(color_modes)
+        self.min_kelvin = min_kelvin
+        self.max_kelvin = max_kelvin
+        self.supports_transition = supports_transition
+
+    @classmethod
+    def from_state(cls, state: State) -> Optional["LightCapabilities"]:
+        """Read capabilities from a light state, or None if it does not report them yet."""
+        modes = state.attributes.get(ATTR_SUPPORTED_COLOR_MODES)
+        if modes is None:
+            return None
+        return cls(
+            frozenset(_GROUP_COLOR_MODES[mode] for mode in modes if mode in _GROUP_COLOR_MODES),
+            state.attributes.get(ATTR_MIN_COLOR_TEMP_KELVIN),
+            state.attributes.get(ATTR_MAX_COLOR_TEMP_KELVIN),
+            bool(state.attributes.get(ATTR_SUPPORTED_FEATURES, 0) & LightEntityFeature.TRANSITION),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both lights have the same capabilities."""
+        if not isinstance(other, LightCapabilities):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the capabilities for diagnostics."""
+        return {
+            "color_modes": sorted(self.color_modes),
+            "color_mode": self.color_mode,
+            "min_kelvin": self.min_kelvin,
+            "max_kelvin": self.max_kelvin,
+            "supports_transition": self.supports_transition,
+        }
+
+
+class CapabilityCache:
+    """Capabilities of a group's lights, filled lazily as their states arrive.
+
+    The color modes of the group are kept as a count of the lights providing
+    each mode, so a light appearing or changing only touches its own modes
+    instead of rescanning the group.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._lights: Dict[str, LightCapabilities] = {}
+        self._mode_counts: Counter = Counter()
+        self.supported_color_modes: Set[ColorMode] = {ColorMode.BRIGHTNESS}
+        self.color_mode = ColorMode.BRIGHTNESS
+
+    def get(self, light_id: str) -> Optional[LightCapabilities]:
+        """Return the cached capabilities of a light."""
+        return self._lights.get(light_id)
+
+    def bucket(self, light_id: str) -> Bucket:
+        """Return the color mode, transition support and kelvin range to shape a light's commands for.
+
+        Lights that have not reported their capabilities yet are treated
+        like the group as a whole. The kelvin range is only part of the
+        bucket for color temperature lights, so other lights share buckets.
+        """
+        capabilities = self._lights.get(light_id)
+        if capabilities is None:
+            return self.color_mode, True, None, None
+        if capabilities.color_mode != ColorMode.COLOR_TEMP:
+            return capabilities.color_mode, capabilities.supports_transition, None, None
+        return (
+            capabilities.color_mode,
+            capabilities.supports_transition,
+            capabilities.min_kelvin,
+            capabilities.max_kelvin,
+        )
+
+    def handle_state(self, light_id: str, state: Optional[State]) -> bool:
+        """Update a light from its latest state.
+
+        Returns:
+            True if the color modes of the group changed.
+        """
+        if state is None:
+            capabilities = None
+        else:
+            capabilities = LightCapabilities.from_state(state)
+            if capabilities is None:
+                # Not loaded yet, keep what was last reported
+                return False
+
+        previous = self._lights.get(light_id)
+        if capabilities == previous:
+            return False
+
+        if capabilities is None:
+            del self._lights[light_id]
+        else:
+            self._lights[light_id] = capabilities
+        _LOGGER.debug("Capabilities of %s: %s", light_id, capabilities.as_dict() if capabilities else None)
+
+        old_modes = previous.color_modes if previous else frozenset()
+        new_modes = capabilities.color_modes if capabilities else frozenset()
+        if old_modes == new_modes:
+            return False
+        self._mode_counts.subtract(old_modes)
+        self._mode_counts.update(new_modes)
+        return self._update_group_modes()
+
+    def _update_group_modes(self) -> bool:
+        """Recompute the group color modes from the mode counts."""
+        modes = {mode for mode, count in self._mode_counts.items() if count > 0}
+        # On/off and brightness cannot be combined with other modes, like Home Assistant's
+        # filter_supported_color_modes; per-light buckets still shape those members' payloads
+        if len(modes) > 1:
+            modes.discard(ColorMode.ONOFF)
+        if len(modes) > 1:
+            modes.discard(ColorMode.BRIGHTNESS)
+        # Always support brightness as minimum
+        if not modes:
+            modes = {ColorMode.BRIGHTNESS}
+        if modes == self.supported_color_modes:
+            return False
+
+        self.supported_color_modes = modes
+        self.color_mode = _preferred_color_mode(modes)
+        return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the cached capabilities for diagnostics."""
+        return {
+            "supported_color_modes": sorted(self.supported_color_modes),
+            "color_mode": self.color_mode,
+            "lights": {light_id: capabilities.as_dict() for light_id, capabilities in self._lights.items()},
+        }
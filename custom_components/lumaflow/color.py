@@ -0,0 +1,80 @@
+"""Color temperature conversion tables for lights without color temperature support."""
+
+from typing import Tuple
+
+import numpy as np
+
+from .const import COLOR_TABLE_MAX_KELVIN, COLOR_TABLE_MIN_KELVIN
+
+# Decimal places of CIE xy values, matching what Home Assistant reports
+XY_PRECISION = 3
+
+# CIE XYZ to linear sRGB (D65)
+_XYZ_TO_SRGB = np.array([
+    [3.2404542, -1.5371385, -0.4985314],
+    [-0.9692660, 1.8760108, 0.0415560],
+    [0.0556434, -0.2040259, 1.0572252],
+])
+
+
+def _planckian_xy(kelvin: np.ndarray) -> np.ndarray:
+    """Return the CIE 1931 xy chromaticity of a blackbody radiator.
+
+    Uses the cubic spline approximation of the Planckian locus by Kim et al.,
+    accurate for 1667 K to 25000 K.
+    """
+    t = kelvin.astype(float)
+    x = np.where(
+        t <= 4000,
+        -0.2661239e9 / t**3 - 0.2343589e6 / t**2 + 0.8776956e3 / t + 0.179910,
+        -3.0258469e9 / t**3 + 2.1070379e6 / t**2 + 0.2226347e3 / t + 0.240390,
+    )
+    y = np.select(
+        [t <= 2222, t <= 4000],
+        [
+            -1.1063814 * x**3 - 1.34811020 * x**2 + 2.18555832 * x - 0.20219683,
+            -0.9549476 * x**3 - 1.37418593 * x**2 + 2.09137015 * x - 0.16748867,
+        ],
+        3.0817580 * x**3 - 5.87338670 * x**2 + 3.75112997 * x - 0.37001483,
+    )
+    return np.stack([x, y], axis=1)
+
+
+def _xy_to_rgb(xy: np.ndarray) -> np.ndarray:
+    """Convert xy chromaticities to full-brightness 8-bit sRGB."""
+    x, y = xy[:, 0], xy[:, 1]
+    xyz = np.stack([x / y, np.ones_like(x), (1 - x - y) / y], axis=1)
+    linear = np.clip(xyz @ _XYZ_TO_SRGB.T, 0.0, None)
+
+    # Brightness is sent separately, so scale the brightest channel to full
+    linear /= linear.max(axis=1, keepdims=True)
+    encoded = np.where(
+        linear <= 0.0031308, 12.92 * linear, 1.055 * np.power(linear, 1 / 2.4) - 0.055
+    )
+    return np.rint(encoded * 255).astype(np.uint8)
+
+
+# One row per kelvin in the supported range, built once at import
+_KELVIN = np.arange(COLOR_TABLE_MIN_KELVIN, COLOR_TABLE_MAX_KELVIN + 1)
+_XY_TABLE = np.round(_planckian_xy(_KELVIN), XY_PRECISION)
+_RGB_TABLE = _xy_to_rgb(_planckian_xy(_KELVIN))
+
+# Plain tuples so lookups return ready-to-send service data
+_XY_VALUES = [tuple(float(value) for value in row) for row in _XY_TABLE]
+_RGB_VALUES = [tuple(int(value) for value in row) for row in _RGB_TABLE]
+
+
+def _index(kelvin: float) -> int:
+    """Return the table row of a color temperature, clamped to the table range."""
+    kelvin = min(max(int(round(kelvin)), COLOR_TABLE_MIN_KELVIN), COLOR_TABLE_MAX_KELVIN)
+    return kelvin - COLOR_TABLE_MIN_KELVIN
+
+
+def kelvin_to_rgb(kelvin: float) -> Tuple[int, int, int]:
+    """Return the sRGB color of a blackbody at a color temperature."""
+    return _RGB_VALUES[_index(kelvin)]
+
+
+def kelvin_to_xy(kelvin: float) -> Tuple[float, float]:
+    """Return the CIE xy chromaticity of a blackbody at a color temperature."""
+    return _XY_VALUES[_index(kelvin)]
@@ -21,6 +21,18 @@ from .const import (
     CONF_MAX_COLOR_TEMP,
     CONF_ENABLE_OVERRIDE_DETECTION,
     CONF_RESTORE_ON_STARTUP,
+    CONF_MAX_CONCURRENT_CALLS,
+    CONF_CALL_TIMEOUT,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_BRIGHTNESS_THRESHOLD,
+    CONF_COLOR_TEMP_THRESHOLD,
+    CONF_CURVE_SHAPE,
+    CONF_CURVE_KEYFRAMES,
+    CONF_MORNING_RAMP,
+    CONF_STARTUP_PRIORITY,
+    CONF_STARTUP_WAVE_SIZE,
+    CONF_STARTUP_WAVE_SPACING,
+    CURVE_SHAPES,
     DEFAULT_SUNSET_OFFSET,
     DEFAULT_TRANSITION_SPEED,
     DEFAULT_MIN_BRIGHTNESS,
@@ -29,9 +41,21 @@ from .const import (
     DEFAULT_MAX_COLOR_TEMP,
     DEFAULT_ENABLE_OVERRIDE_DETECTION,
     DEFAULT_RESTORE_ON_STARTUP,
+    DEFAULT_MAX_CONCURRENT_CALLS,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_BRIGHTNESS_THRESHOLD,
+    DEFAULT_COLOR_TEMP_THRESHOLD,
+    DEFAULT_CURVE_SHAPE,
+    DEFAULT_CURVE_KEYFRAMES,
+    DEFAULT_MORNING_RAMP,
+    DEFAULT_STARTUP_PRIORITY,
+    DEFAULT_STARTUP_WAVE_SIZE,
+    DEFAULT_STARTUP_WAVE_SPACING,
     DOMAIN,
     NAME,
 )
+from .curves import CompiledCurve
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -242,8 +266,17 @@ class LumaFlowOptionsFlow(config_entries.OptionsFlow):
         self, user_input: Optional[Dict[str, Any]] = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: Dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                CompiledCurve.compile(
+                    user_input[CONF_CURVE_SHAPE], user_input.get(CONF_CURVE_KEYFRAMES)
+                )
+            except ValueError:
+                errors["base"] = "invalid_keyframes"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         data_schema = vol.Schema({
             vol.Required(
@@ -280,9 +313,128 @@ class LumaFlowOptionsFlow(config_entries.OptionsFlow):
                     self.config_entry.data.get(CONF_ENABLE_OVERRIDE_DETECTION, DEFAULT_ENABLE_OVERRIDE_DETECTION)
                 )
             ): selector.BooleanSelector(),
+            vol.Required(
+                CONF_MAX_CONCURRENT_CALLS,
+                default=self.config_entry.options.get(CONF_MAX_CONCURRENT_CALLS, DEFAULT_MAX_CONCURRENT_CALLS)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=50,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_CALL_TIMEOUT,
+                default=self.config_entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=60,
+                    step=1,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_COMMAND_DEBOUNCE,
+                default=self.config_entry.options.get(CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=2000,
+                    step=50,
+                    unit_of_measurement="ms",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_BRIGHTNESS_THRESHOLD,
+                default=self.config_entry.options.get(CONF_BRIGHTNESS_THRESHOLD, DEFAULT_BRIGHTNESS_THRESHOLD)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=25,
+                    step=1,
+                    unit_of_measurement="%",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_COLOR_TEMP_THRESHOLD,
+                default=self.config_entry.options.get(CONF_COLOR_TEMP_THRESHOLD, DEFAULT_COLOR_TEMP_THRESHOLD)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=1000,
+                    step=1,
+                    unit_of_measurement="K",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_CURVE_SHAPE,
+                default=self.config_entry.options.get(CONF_CURVE_SHAPE, DEFAULT_CURVE_SHAPE)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=CURVE_SHAPES,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_CURVE_KEYFRAMES,
+                default=self.config_entry.options.get(CONF_CURVE_KEYFRAMES, DEFAULT_CURVE_KEYFRAMES)
+            ): selector.TextSelector(),
+            vol.Required(
+                CONF_MORNING_RAMP,
+                default=self.config_entry.options.get(CONF_MORNING_RAMP, DEFAULT_MORNING_RAMP)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=240,
+                    step=5,
+                    unit_of_measurement="minutes",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_STARTUP_PRIORITY,
+                default=self.config_entry.options.get(CONF_STARTUP_PRIORITY, DEFAULT_STARTUP_PRIORITY)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=10,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_STARTUP_WAVE_SIZE,
+                default=self.config_entry.options.get(CONF_STARTUP_WAVE_SIZE, DEFAULT_STARTUP_WAVE_SIZE)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=100,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_STARTUP_WAVE_SPACING,
+                default=self.config_entry.options.get(CONF_STARTUP_WAVE_SPACING, DEFAULT_STARTUP_WAVE_SPACING)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=60,
+                    step=1,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
         })
 
         return self.async_show_form(
             step_id="init",
             data_schema=data_schema,
+            errors=errors,
         ) 
\ No newline at end of file
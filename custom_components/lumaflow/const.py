@@ -1,5 +1,7 @@
 """Constants for LumaFlow integration."""
 
+from datetime import timedelta
+
 from homeassistant.const import Platform
 
 DOMAIN = "lumaflow"
@@ -21,6 +23,17 @@ CONF_MIN_COLOR_TEMP = "min_color_temp"
 CONF_MAX_COLOR_TEMP = "max_color_temp"
 CONF_ENABLE_OVERRIDE_DETECTION = "enable_override_detection"
 CONF_RESTORE_ON_STARTUP = "restore_on_startup"
+CONF_MAX_CONCURRENT_CALLS = "max_concurrent_calls"
+CONF_CALL_TIMEOUT = "call_timeout"
+CONF_COMMAND_DEBOUNCE = "command_debounce"
+CONF_BRIGHTNESS_THRESHOLD = "brightness_threshold"
+CONF_COLOR_TEMP_THRESHOLD = "color_temp_threshold"
+CONF_CURVE_SHAPE = "curve_shape"
+CONF_CURVE_KEYFRAMES = "curve_keyframes"
+CONF_MORNING_RAMP = "morning_ramp"
+CONF_STARTUP_PRIORITY = "startup_priority"
+CONF_STARTUP_WAVE_SIZE = "startup_wave_size"
+CONF_STARTUP_WAVE_SPACING = "startup_wave_spacing"
 
 # Default values
 DEFAULT_SUNSET_OFFSET = 0  # minutes
@@ -31,6 +44,17 @@ DEFAULT_MIN_COLOR_TEMP = 2700  # Warm white
 DEFAULT_MAX_COLOR_TEMP = 6500  # Cool white
 DEFAULT_ENABLE_OVERRIDE_DETECTION = True
 DEFAULT_RESTORE_ON_STARTUP = True
+DEFAULT_MAX_CONCURRENT_CALLS = 10
+DEFAULT_CALL_TIMEOUT = 10  # seconds
+DEFAULT_COMMAND_DEBOUNCE = 0  # milliseconds, 0 sends background commands at once
+DEFAULT_BRIGHTNESS_THRESHOLD = 2  # percent
+DEFAULT_COLOR_TEMP_THRESHOLD = 50  # Kelvin
+DEFAULT_CURVE_SHAPE = "linear"
+DEFAULT_CURVE_KEYFRAMES = "0:0, 100:100"
+DEFAULT_MORNING_RAMP = 0  # minutes, 0 disables the morning ramp
+DEFAULT_STARTUP_PRIORITY = 5  # lower groups are reconciled first
+DEFAULT_STARTUP_WAVE_SIZE = 10  # lights
+DEFAULT_STARTUP_WAVE_SPACING = 5  # seconds
 
 # Transition speeds
 TRANSITION_SPEEDS = {
@@ -39,6 +63,20 @@ TRANSITION_SPEEDS = {
     "fast": 60,      # 1 minute
 }
 
+# Update scheduling
+MIN_UPDATE_INTERVAL = timedelta(minutes=1)
+
+# Sample spacing of the precomputed lighting curves
+CURVE_RESOLUTION = timedelta(minutes=1)
+
+# Curve shapes
+CURVE_LINEAR = "linear"
+CURVE_SIGMOID = "sigmoid"
+CURVE_EASE_IN_OUT = "ease_in_out"
+CURVE_KEYFRAMES = "keyframes"
+CURVE_SHAPES = [CURVE_LINEAR, CURVE_SIGMOID, CURVE_EASE_IN_OUT, CURVE_KEYFRAMES]
+CURVE_TABLE_SIZE = 1025  # lookup table samples over a ramp
+
 # Circadian phases
 PHASE_DAY = "day"
 PHASE_SUNSET = "sunset"
@@ -46,6 +84,30 @@ PHASE_EVENING = "evening"
 PHASE_NIGHT = "night"
 PHASE_SUNRISE = "sunrise"
 
+# Phase durations after the adjusted sunset
+SUNSET_PHASE_HOURS = 1
+EVENING_PHASE_HOURS = 4
+
+# Dispatcher signals
+SIGNAL_GROUP_UPDATED = "lumaflow_group_updated_{}"
+
+# hass.data keys for domain-wide objects
+DATA_TRACKER = "tracker"
+DATA_SCHEDULER = "scheduler"
+DATA_THROTTLE = "throttle"
+DATA_PENDING = "pending"
+DATA_STORE = "store"
+DATA_RECONCILER = "reconciler"
+DATA_ENTITIES = "entities"
+
+# Startup reconciliation
+STARTUP_AVAILABILITY_TIMEOUT = 120  # seconds to wait for member lights to load
+
+# Persisted runtime state of all groups
+STORAGE_KEY = f"{DOMAIN}.state"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # seconds, so a burst of changes is written once
+
 # Entity IDs
 SENSOR_CURRENT_PHASE = "lumaflow_current_phase"
 SENSOR_NEXT_TRANSITION = "lumaflow_next_transition"
@@ -65,4 +127,48 @@ ATTR_TRANSITION = "transition"
 ATTR_CIRCADIAN_ENABLED = "circadian_enabled"
 ATTR_CURRENT_PHASE = "current_phase"
 ATTR_OVERRIDDEN = "overridden"
-ATTR_CONTROLLED_LIGHTS = "controlled_lights" 
\ No newline at end of file
+ATTR_CONTROLLED_LIGHTS = "controlled_lights"
+ATTR_OVERRIDDEN_LIGHTS = "overridden_lights"
+
+# Solar schedule cache
+SOLAR_CACHE_DAYS_AHEAD = 3  # days computed per cache miss
+SOLAR_CACHE_MAX_ENTRIES = 64  # location-days kept, least recently used evicted first
+
+# Days without sunrise or sunset at high latitudes
+POLAR_DAY = "polar_day"
+POLAR_NIGHT = "polar_night"
+POLAR_DAY_LENGTH_HOURS = 12  # nominal day used instead
+
+# Kelvin range of the precomputed color conversion tables
+COLOR_TABLE_MIN_KELVIN = 2000
+COLOR_TABLE_MAX_KELVIN = 6500
+
+# Runtime metrics
+METRICS_WINDOW_SIZE = 500  # samples kept per timing metric
+METRICS_RATE_MINUTES = 15  # minutes averaged by per-minute rates
+METRICS_WRITE_INTERVAL = 10  # minimum seconds between state writes of a metric sensor
+METRICS_RATE_REFRESH = 60  # seconds between refreshes of a nonzero rate without new commands
+
+# Command trace, per group
+TRACE_CAPACITY = 1024  # light commands kept
+TRACE_PAYLOADS = 64  # distinct payloads kept for lookup by hash
+
+# Domain-wide light command rate limits, per integration of the member light
+DEFAULT_COMMAND_RATE = 20  # commands per second
+COMMAND_BURST_SECONDS = 2  # commands allowed in a burst, in seconds of rate
+PLATFORM_COMMAND_RATES = {
+    # Conservative limits for bridges and radio networks
+    "hue": 10,
+    "zha": 10,
+    "deconz": 10,
+    "tradfri": 5,
+}
+
+# Per-light circuit breakers for lights that keep failing
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures before a light is skipped
+CIRCUIT_INITIAL_BACKOFF = 30  # seconds before the first retry
+CIRCUIT_MAX_BACKOFF = 3600  # seconds, cap of the doubling backoff
+
+# Command priorities, lower first
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
@@ -1,13 +1,15 @@
 """LumaFlow coordinator for managing astronomical calculations and light state."""
 
 import logging
+import time
 from datetime import datetime, timedelta, date
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
 
+import numpy as np
 from astral import LocationInfo
-from astral.sun import sun
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
@@ -21,23 +23,75 @@ from .const import (
     CONF_MIN_COLOR_TEMP,
     CONF_MAX_COLOR_TEMP,
     CONF_ENABLE_OVERRIDE_DETECTION,
+    CONF_MAX_CONCURRENT_CALLS,
+    CONF_CALL_TIMEOUT,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_BRIGHTNESS_THRESHOLD,
+    CONF_COLOR_TEMP_THRESHOLD,
+    CONF_CURVE_SHAPE,
+    CONF_CURVE_KEYFRAMES,
+    CONF_MORNING_RAMP,
+    CONF_STARTUP_PRIORITY,
+    CONF_STARTUP_WAVE_SIZE,
+    CONF_STARTUP_WAVE_SPACING,
+    CURVE_LINEAR,
+    CURVE_RESOLUTION,
+    DATA_STORE,
     DEFAULT_SUNSET_OFFSET,
     DEFAULT_TRANSITION_SPEED,
     DEFAULT_MIN_BRIGHTNESS,
     DEFAULT_MAX_BRIGHTNESS,
     DEFAULT_MIN_COLOR_TEMP,
     DEFAULT_MAX_COLOR_TEMP,
+    DEFAULT_MAX_CONCURRENT_CALLS,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_BRIGHTNESS_THRESHOLD,
+    DEFAULT_COLOR_TEMP_THRESHOLD,
+    DEFAULT_CURVE_SHAPE,
+    DEFAULT_CURVE_KEYFRAMES,
+    DEFAULT_MORNING_RAMP,
+    DEFAULT_STARTUP_PRIORITY,
+    DEFAULT_STARTUP_WAVE_SIZE,
+    DEFAULT_STARTUP_WAVE_SPACING,
     DOMAIN,
+    EVENING_PHASE_HOURS,
+    MIN_UPDATE_INTERVAL,
     PHASE_DAY,
     PHASE_SUNSET,
     PHASE_EVENING,
     PHASE_NIGHT,
     PHASE_SUNRISE,
+    SIGNAL_GROUP_UPDATED,
+    SUNSET_PHASE_HOURS,
     TRANSITION_SPEEDS,
 )
+from .capabilities import CapabilityCache
+from .curves import CompiledCurve, DayCurve, sample_lighting
+from .dispatch import LightDispatcher
+from .metrics import GroupMetrics
+from .solar import get_sun_times, sun_event_arrays
+
+if TYPE_CHECKING:
+    from .light import LumaFlowLight
 
 _LOGGER = logging.getLogger(__name__)
 
+# Light attributes whose external change counts as a manual override
+OVERRIDE_ATTRIBUTES = (
+    "brightness",
+    "color_mode",
+    "color_temp_kelvin",
+    "hs_color",
+    "rgb_color",
+    "xy_color",
+)
+
+
+def _observable(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the part of coordinator data that listeners care about."""
+    return {key: value for key, value in data.items() if key != "next_update"}
+
 
 class LumaFlowCoordinator(DataUpdateCoordinator):
     """Coordinator for LumaFlow data updates."""
@@ -58,6 +112,65 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
         self.min_color_temp = entry.data.get(CONF_MIN_COLOR_TEMP, DEFAULT_MIN_COLOR_TEMP)
         self.max_color_temp = entry.data.get(CONF_MAX_COLOR_TEMP, DEFAULT_MAX_COLOR_TEMP)
         self.enable_override_detection = entry.options.get(CONF_ENABLE_OVERRIDE_DETECTION, entry.data.get(CONF_ENABLE_OVERRIDE_DETECTION, True))
+        self.max_concurrent_calls = entry.options.get(CONF_MAX_CONCURRENT_CALLS, DEFAULT_MAX_CONCURRENT_CALLS)
+        self.call_timeout = entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT)
+        self.command_debounce = entry.options.get(CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE)
+        self.brightness_threshold = entry.options.get(CONF_BRIGHTNESS_THRESHOLD, DEFAULT_BRIGHTNESS_THRESHOLD)
+        self.color_temp_threshold = entry.options.get(CONF_COLOR_TEMP_THRESHOLD, DEFAULT_COLOR_TEMP_THRESHOLD)
+        self.curve_shape = entry.options.get(CONF_CURVE_SHAPE, DEFAULT_CURVE_SHAPE)
+        self.curve_keyframes = entry.options.get(CONF_CURVE_KEYFRAMES, DEFAULT_CURVE_KEYFRAMES)
+        self.morning_ramp = entry.options.get(CONF_MORNING_RAMP, DEFAULT_MORNING_RAMP)
+        self.startup_priority = entry.options.get(CONF_STARTUP_PRIORITY, DEFAULT_STARTUP_PRIORITY)
+        self.startup_wave_size = int(entry.options.get(CONF_STARTUP_WAVE_SIZE, DEFAULT_STARTUP_WAVE_SIZE))
+        self.startup_wave_spacing = entry.options.get(CONF_STARTUP_WAVE_SPACING, DEFAULT_STARTUP_WAVE_SPACING)
+        
+        # Ramp shape, compiled once into a lookup table
+        self.curve = self._compile_curve()
+        
+        # Timing and throughput of this group's work
+        self.metrics = GroupMetrics()
+        
+        # Concurrent fan-out of light service calls for this group
+        self.dispatcher = LightDispatcher(
+            hass,
+            self.group_name,
+            self.max_concurrent_calls,
+            self.call_timeout,
+            self.metrics,
+            self.command_debounce / 1000,
+        )
+        
+        # Lights manually adjusted outside LumaFlow since the last daily reset
+        self.overridden_lights: Set[str] = set()
+        
+        # Controlled lights currently on, maintained from state change events
+        self.lights_on: Set[str] = set()
+        
+        # Lights enabled through their LumaFlow switches
+        self.enabled_lights: Set[str] = set(self.controlled_lights)
+        
+        # Circadian control and manual override of the group light entity
+        self.circadian_enabled = True
+        self.overridden = False
+        
+        # Circadian values and phase last pushed to the lights by the group light
+        self.last_applied_values: Optional[Dict[str, Any]] = None
+        self.last_applied_phase: Optional[str] = None
+        
+        # Set while the startup reconciliation has not reached this group yet
+        self.reconciling = False
+        
+        # Color modes and ranges of the controlled lights, filled as they load
+        self.capabilities = CapabilityCache()
+        
+        # Group light entity of this entry, set while it is added to hass
+        self.light_entity: Optional["LumaFlowLight"] = None
+        
+        # When the shared scheduler should next evaluate this group
+        self.next_update: Optional[datetime] = None
+        
+        # Sampled lighting curves by solar date
+        self._day_curves: Dict[date, DayCurve] = {}
         
         # Set up location for astronomical calculations
         self._setup_location()
@@ -66,7 +179,8 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{self.group_name}",
-            update_interval=timedelta(minutes=1),
+            # Driven by the domain-wide LumaFlowScheduler instead of a timer
+            update_interval=None,
         )
         
         # Listen for options updates
@@ -93,34 +207,69 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Update circadian data."""
+        now = dt_util.utcnow()
         try:
-            now = dt_util.utcnow()
-            today = now.date()
-            
-            # Calculate astronomical times
-            sun_times = sun(self.location.observer, date=today)
-            
-            # Apply sunset offset
-            sunset_adjusted = sun_times["sunset"] + timedelta(minutes=self.sunset_offset)
-            
-            # Calculate current phase
-            current_phase = self._calculate_current_phase(now, sun_times, sunset_adjusted)
-            
-            # Calculate lighting values based on current phase
-            lighting_values = self._calculate_lighting_values(now, sun_times, sunset_adjusted)
-            
-            return {
-                "sun_times": sun_times,
-                "sunset_adjusted": sunset_adjusted,
-                "current_phase": current_phase,
-                "lighting_values": lighting_values,
-                "controlled_lights": self.controlled_lights,
-                "group_name": self.group_name,
-            }
-            
+            return self.calculate_data(now)
         except Exception as err:
+            # Retry soon rather than after a possibly hours-long interval
+            self.next_update = now + MIN_UPDATE_INTERVAL
             raise UpdateFailed(f"Error updating LumaFlow data for {self.group_name}: {err}") from err
 
+    @callback
+    def async_tick(self, now: datetime) -> None:
+        """Recalculate on the shared clock, notifying listeners only on change."""
+        try:
+            data = self.calculate_data(now)
+        except Exception as err:
+            self.next_update = now + MIN_UPDATE_INTERVAL
+            _LOGGER.error("Error updating LumaFlow data for %s: %s", self.group_name, err)
+            return
+        
+        if self.data is not None and _observable(data) == _observable(self.data):
+            # Only the scheduling changed; keep listeners quiet
+            self.data = data
+            return
+        
+        self.async_set_updated_data(data)
+
+    def calculate_data(self, now: datetime) -> Dict[str, Any]:
+        """Calculate circadian data for a point in time and schedule the next one."""
+        started = time.perf_counter()
+        today = now.date()
+        
+        # Manual overrides clear once per local day
+        self._async_daily_reset()
+        
+        # Astronomical times are shared by all groups at this location
+        sun_times = get_sun_times(self.location.latitude, self.location.longitude, today)
+        
+        # Apply sunset offset on top of the shared schedule
+        sunset_adjusted = sun_times["sunset"] + timedelta(minutes=self.sunset_offset)
+        
+        # Calculate current phase
+        current_phase = self._calculate_current_phase(now, sun_times, sunset_adjusted)
+        
+        # Calculate lighting values based on current phase
+        lighting_values = self._calculate_lighting_values(now)
+        
+        # Sleep until the next observable change instead of polling
+        next_update = max(
+            self._calculate_next_update(now, sun_times, sunset_adjusted),
+            now + MIN_UPDATE_INTERVAL,
+        )
+        self.next_update = next_update
+        self.metrics.record_update(time.perf_counter() - started)
+        
+        return {
+            "sun_times": sun_times,
+            "sunset_adjusted": sunset_adjusted,
+            "current_phase": current_phase,
+            "lighting_values": lighting_values,
+            "next_update": next_update,
+            "controlled_lights": self.controlled_lights,
+            "group_name": self.group_name,
+        }
+
     def _calculate_current_phase(
         self, now: datetime, sun_times: Dict[str, datetime], sunset_adjusted: datetime
     ) -> str:
@@ -131,11 +280,13 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
         # Define phase boundaries
         if now < sunrise:
             phase = PHASE_NIGHT
+        elif now < min(sunrise + timedelta(minutes=self.morning_ramp), sunset_adjusted):
+            phase = PHASE_SUNRISE
         elif now < sunset_adjusted:
             phase = PHASE_DAY
-        elif now < sunset_adjusted + timedelta(hours=1):
+        elif now < sunset_adjusted + timedelta(hours=SUNSET_PHASE_HOURS):
             phase = PHASE_SUNSET
-        elif now < sunset_adjusted + timedelta(hours=4):
+        elif now < sunset_adjusted + timedelta(hours=EVENING_PHASE_HOURS):
             phase = PHASE_EVENING
         else:
             phase = PHASE_NIGHT
@@ -145,42 +296,240 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
                      sunset_adjusted.strftime("%H:%M"), phase)
         return phase
 
-    def _calculate_lighting_values(
-        self, now: datetime, sun_times: Dict[str, datetime], sunset_adjusted: datetime
-    ) -> Dict[str, Any]:
+    def _calculate_lighting_values(self, now: datetime) -> Dict[str, Any]:
         """Calculate lighting values based on time since sunset."""
-        if now < sunset_adjusted:
-            # Before sunset - use day values
-            brightness = self.max_brightness
-            color_temp = self.max_color_temp
-            _LOGGER.debug("Daylight values for %s: brightness=%s%%, color_temp=%sK", 
-                         self.group_name, brightness, color_temp)
-            
-        else:
-            # After sunset - calculate based on time elapsed
-            time_since_sunset = (now - sunset_adjusted).total_seconds() / 3600  # hours
-            
-            # Calculate progression (0 = just after sunset, 1 = deep night)
-            max_progression_hours = 4  # 4 hours to reach minimum values
-            progression = min(time_since_sunset / max_progression_hours, 1.0)
-            
-            # Calculate brightness (linear decrease)
-            brightness_range = self.max_brightness - self.min_brightness
-            brightness = self.max_brightness - (brightness_range * progression)
-            
-            # Calculate color temperature (linear decrease to warmer)
-            color_temp_range = self.max_color_temp - self.min_color_temp
-            color_temp = self.max_color_temp - (color_temp_range * progression)
-            
-            _LOGGER.debug("Evening values for %s: time_since_sunset=%.1fh, progression=%.2f, brightness=%s%%, color_temp=%sK", 
-                         self.group_name, time_since_sunset, progression, int(brightness), int(color_temp))
+        brightness, color_temp = self.get_day_curve(now.date()).values_at(now)
+        _LOGGER.debug("Lighting values for %s: brightness=%s%%, color_temp=%sK",
+                     self.group_name, int(brightness), int(color_temp))
         
         return {
             "brightness": int(brightness),
             "color_temp": int(color_temp),
             "transition": TRANSITION_SPEEDS.get(self.transition_speed, 180),
         }
+
+    def lighting_values_at(self, when: datetime) -> Dict[str, Any]:
+        """Return the lighting values the group will have at a point in time."""
+        return self._calculate_lighting_values(dt_util.as_utc(when))
+
+    def get_day_curve(self, day: date) -> DayCurve:
+        """Return the curve for a solar (UTC) date, cached until the date rolls over."""
+        curve = self._day_curves.get(day)
+        if curve is not None:
+            return curve
+        
+        # Drop days that have passed
+        for cached_day in [cached_day for cached_day in self._day_curves if cached_day < day]:
+            del self._day_curves[cached_day]
+        
+        # Stop short of midnight, where the next date's sun times take over
+        start = datetime.combine(day, datetime.min.time(), tzinfo=dt_util.UTC)
+        curve = self.calculate_curve(start, start + timedelta(days=1) - CURVE_RESOLUTION)
+        self._day_curves[day] = curve
+        return curve
+
+    def calculate_curve(
+        self, start: datetime, end: datetime, resolution: timedelta = CURVE_RESOLUTION
+    ) -> DayCurve:
+        """Calculate brightness and color temperature for a time range in one pass.
+        
+        Args:
+            start: First sample time.
+            end: Last sample time, inclusive.
+            resolution: Time between samples.
+        
+        Returns:
+            The sampled curve.
+        """
+        start = dt_util.as_utc(start)
+        count = int((end - start) / resolution) + 1
+        timestamps = start.timestamp() + np.arange(count) * resolution.total_seconds()
+        
+        # Sun times are looked up per UTC date, as in calculate_data
+        sunrises, sunsets = sun_event_arrays(self.location.latitude, self.location.longitude, timestamps)
+        brightness, color_temp = sample_lighting(
+            timestamps - sunrises,
+            timestamps - (sunsets + self.sunset_offset * 60),
+            (self.min_brightness, self.max_brightness),
+            (self.min_color_temp, self.max_color_temp),
+            self.morning_ramp * 60,
+            self.curve,
+        )
+        
+        return DayCurve(start=start, resolution=resolution, brightness=brightness, color_temp=color_temp)
+
+    def _compile_curve(self) -> CompiledCurve:
+        """Compile the configured ramp shape, falling back to linear if invalid."""
+        try:
+            return CompiledCurve.compile(self.curve_shape, self.curve_keyframes)
+        except ValueError as err:
+            _LOGGER.warning("Invalid curve for %s, using linear: %s", self.group_name, err)
+            return CompiledCurve.compile(CURVE_LINEAR)
     
+    def _calculate_next_update(
+        self, now: datetime, sun_times: Dict[str, datetime], sunset_adjusted: datetime
+    ) -> datetime:
+        """Calculate when the phase or lighting values next change."""
+        # Phase boundaries, plus the date rollover that refreshes sun times
+        candidates = [
+            sun_times["sunrise"],
+            sun_times["sunrise"] + timedelta(minutes=self.morning_ramp),
+            sunset_adjusted,
+            sunset_adjusted + timedelta(hours=SUNSET_PHASE_HOURS),
+            sunset_adjusted + timedelta(hours=EVENING_PHASE_HOURS),
+            datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo),
+            # Local midnight, for the daily override reset
+            dt_util.start_of_local_day(dt_util.as_local(now).date() + timedelta(days=1)),
+        ]
+        
+        # Next integer step of brightness or color temperature
+        step_time = self.get_day_curve(now.date()).next_change(now)
+        if step_time is not None:
+            candidates.append(step_time)
+        
+        next_update = min(candidate for candidate in candidates if candidate > now)
+        _LOGGER.debug("Next update for %s at %s", self.group_name, next_update.strftime("%H:%M:%S"))
+        return next_update
+
+    @callback
+    def _async_daily_reset(self) -> None:
+        """Clear manual overrides when the local date changes."""
+        local_today = dt_util.now().date()
+        if self._last_reset_date == local_today:
+            return
+        
+        if self._last_reset_date is not None and self.overridden_lights:
+            _LOGGER.info("Daily reset of overridden lights for %s: %s", self.group_name, sorted(self.overridden_lights))
+            self.async_clear_overrides()
+        self._last_reset_date = local_today
+
+    @callback
+    def async_sync_light_states(self) -> None:
+        """Seed the set of lights that are on and their capabilities from the state machine."""
+        self.lights_on = set()
+        for light_id in self.controlled_lights:
+            state = self.hass.states.get(light_id)
+            self.capabilities.handle_state(light_id, state)
+            self.dispatcher.health.handle_state(light_id, state)
+            if state is not None and state.state == "on":
+                self.lights_on.add(light_id)
+
+    @callback
+    def async_handle_light_state(self, event: Event) -> None:
+        """Handle a state change of one of this group's lights."""
+        light_id = event.data["entity_id"]
+        old_state: Optional[State] = event.data.get("old_state")
+        new_state: Optional[State] = event.data.get("new_state")
+        
+        # Keep the on set current and tell the group light when it flips
+        was_on = bool(self.lights_on)
+        if new_state is not None and new_state.state == "on":
+            self.lights_on.add(light_id)
+        else:
+            self.lights_on.discard(light_id)
+        modes_changed = self.capabilities.handle_state(light_id, new_state)
+        if was_on != bool(self.lights_on) or modes_changed:
+            async_dispatcher_send(self.hass, SIGNAL_GROUP_UPDATED.format(self.entry.entry_id))
+        
+        if self.enable_override_detection and self._is_manual_change(light_id, old_state, new_state, event.context):
+            _LOGGER.info("Manual change detected on %s, marking it overridden in %s", light_id, self.group_name)
+            self.async_set_overrides([light_id])
+        
+        self.dispatcher.applied_states.handle_state(light_id, new_state)
+        self.dispatcher.health.handle_state(light_id, new_state)
+
+    def _is_manual_change(
+        self, light_id: str, old_state: Optional[State], new_state: Optional[State], context: Context
+    ) -> bool:
+        """Return True if a light was adjusted by something other than LumaFlow."""
+        if light_id in self.overridden_lights or old_state is None or new_state is None:
+            return False
+        
+        # Turning a light on or off is not an override, only adjusting it while on
+        if old_state.state != "on" or new_state.state != "on":
+            return False
+        
+        if self.dispatcher.is_own_context(context):
+            return False
+        
+        # Lights reporting their way through a transition outlive the command's context
+        if self.dispatcher.applied_states.in_transition(light_id):
+            return False
+        
+        if all(old_state.attributes.get(attr) == new_state.attributes.get(attr) for attr in OVERRIDE_ATTRIBUTES):
+            return False
+        
+        # Late reports of our own command still match what was applied
+        return not self.dispatcher.applied_states.matches(light_id, new_state)
+
+    @callback
+    def async_set_overrides(self, light_ids: Iterable[str]) -> None:
+        """Mark lights as manually overridden."""
+        light_ids = list(light_ids)
+        self.overridden_lights.update(light_ids)
+        # They no longer show what LumaFlow applied, even mid-transition
+        for light_id in light_ids:
+            self.dispatcher.applied_states.invalidate(light_id)
+        self.async_save_state()
+        async_dispatcher_send(self.hass, SIGNAL_GROUP_UPDATED.format(self.entry.entry_id))
+
+    @callback
+    def async_clear_overrides(self, light_ids: Optional[Iterable[str]] = None) -> None:
+        """Clear manual overrides for the given lights, or for all lights."""
+        if light_ids is None:
+            self.overridden_lights.clear()
+        else:
+            self.overridden_lights.difference_update(light_ids)
+        self.async_save_state()
+        async_dispatcher_send(self.hass, SIGNAL_GROUP_UPDATED.format(self.entry.entry_id))
+
+    @callback
+    def async_restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore runtime state saved before the last restart."""
+        if not state:
+            return
+        
+        controlled = set(self.controlled_lights)
+        self.circadian_enabled = state.get("circadian_enabled", True)
+        self.overridden = state.get("overridden", False)
+        self.overridden_lights = controlled.intersection(state.get("overridden_lights", []))
+        # Lights added to the group since then start enabled
+        self.enabled_lights = controlled.difference(state.get("disabled_lights", []))
+        self.last_applied_values = state.get("last_applied_values")
+        self.last_applied_phase = state.get("last_applied_phase")
+        
+        # Overrides from before a restart over midnight still clear on the first update
+        if state.get("reset_date"):
+            self._last_reset_date = date.fromisoformat(state["reset_date"])
+        
+        _LOGGER.debug("Restored state of %s: %s", self.group_name, state)
+
+    @callback
+    def async_record_applied_values(self, lighting_values: Dict[str, Any]) -> None:
+        """Remember the circadian values last pushed to the lights."""
+        self.last_applied_values = dict(lighting_values)
+        self.last_applied_phase = self.data.get("current_phase") if self.data else None
+        self.async_save_state()
+
+    def as_stored_state(self) -> Dict[str, Any]:
+        """Return the runtime state to persist across restarts."""
+        return {
+            "circadian_enabled": self.circadian_enabled,
+            "overridden": self.overridden,
+            "overridden_lights": sorted(self.overridden_lights),
+            "disabled_lights": sorted(set(self.controlled_lights) - self.enabled_lights),
+            "last_applied_values": self.last_applied_values,
+            "last_applied_phase": self.last_applied_phase,
+            "reset_date": self._last_reset_date.isoformat() if self._last_reset_date else None,
+        }
+
+    @callback
+    def async_save_state(self) -> None:
+        """Schedule a write of the runtime state, batched with other changes."""
+        store = self.hass.data.get(DOMAIN, {}).get(DATA_STORE)
+        if store is not None:
+            store.async_set(self.entry.entry_id, self.as_stored_state())
+
     async def async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Handle options update."""
         _LOGGER.debug("Options updated for %s, refreshing configuration", self.group_name)
@@ -189,6 +538,29 @@ class LumaFlowCoordinator(DataUpdateCoordinator):
         self.sunset_offset = entry.options.get(CONF_SUNSET_OFFSET, entry.data.get(CONF_SUNSET_OFFSET, DEFAULT_SUNSET_OFFSET))
         self.transition_speed = entry.options.get(CONF_TRANSITION_SPEED, entry.data.get(CONF_TRANSITION_SPEED, DEFAULT_TRANSITION_SPEED))
         self.enable_override_detection = entry.options.get(CONF_ENABLE_OVERRIDE_DETECTION, entry.data.get(CONF_ENABLE_OVERRIDE_DETECTION, True))
+        self.max_concurrent_calls = entry.options.get(CONF_MAX_CONCURRENT_CALLS, DEFAULT_MAX_CONCURRENT_CALLS)
+        self.call_timeout = entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT)
+        self.command_debounce = entry.options.get(CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE)
+        self.brightness_threshold = entry.options.get(CONF_BRIGHTNESS_THRESHOLD, DEFAULT_BRIGHTNESS_THRESHOLD)
+        self.color_temp_threshold = entry.options.get(CONF_COLOR_TEMP_THRESHOLD, DEFAULT_COLOR_TEMP_THRESHOLD)
+        self.curve_shape = entry.options.get(CONF_CURVE_SHAPE, DEFAULT_CURVE_SHAPE)
+        self.curve_keyframes = entry.options.get(CONF_CURVE_KEYFRAMES, DEFAULT_CURVE_KEYFRAMES)
+        self.morning_ramp = entry.options.get(CONF_MORNING_RAMP, DEFAULT_MORNING_RAMP)
+        self.startup_priority = entry.options.get(CONF_STARTUP_PRIORITY, DEFAULT_STARTUP_PRIORITY)
+        self.startup_wave_size = int(entry.options.get(CONF_STARTUP_WAVE_SIZE, DEFAULT_STARTUP_WAVE_SIZE))
+        self.startup_wave_spacing = entry.options.get(CONF_STARTUP_WAVE_SPACING, DEFAULT_STARTUP_WAVE_SPACING)
+        self.dispatcher.configure(self.max_concurrent_calls, self.call_timeout, self.command_debounce / 1000)
+        self.curve = self._compile_curve()
+        self._day_curves.clear()
         
         # Force a refresh to apply new settings
-        await self.async_request_refresh() 
\ No newline at end of file
+        await self.async_request_refresh()
+
+
+@callback
+def async_get_coordinators(hass: HomeAssistant) -> List[LumaFlowCoordinator]:
+    """Return the coordinators of all loaded LumaFlow entries."""
+    return [
+        value for value in hass.data.get(DOMAIN, {}).values()
+        if isinstance(value, LumaFlowCoordinator)
+    ]
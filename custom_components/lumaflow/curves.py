@@ -0,0 +1,226 @@
+"""Vectorized lighting curves for LumaFlow groups."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .const import (
+    CURVE_EASE_IN_OUT,
+    CURVE_KEYFRAMES,
+    CURVE_LINEAR,
+    CURVE_SIGMOID,
+    CURVE_TABLE_SIZE,
+    EVENING_PHASE_HOURS,
+    PHASE_DAY,
+    PHASE_EVENING,
+    PHASE_NIGHT,
+    PHASE_SUNRISE,
+    PHASE_SUNSET,
+    SUNSET_PHASE_HOURS,
+)
+
+# Slope of the logistic function used for sigmoid ramps
+SIGMOID_STEEPNESS = 10.0
+
+
+def parse_keyframes(text: str) -> List[Tuple[float, float]]:
+    """Parse keyframes like ``"0:0, 50:80, 100:100"``.
+
+    Each keyframe is a percentage of the ramp duration followed by the
+    percentage of the change reached at that point. The first and last
+    keyframes must be at 0 and 100 percent of the ramp.
+
+    Raises:
+        ValueError: If the keyframes are malformed.
+    """
+    points = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        time_pct, value_pct = item.split(":")
+        points.append((float(time_pct) / 100, float(value_pct) / 100))
+    points.sort()
+
+    times = [time for time, _ in points]
+    if len(points) < 2 or times[0] != 0 or times[-1] != 1 or len(set(times)) != len(times):
+        raise ValueError("keyframes must cover 0 to 100 percent of the ramp without repeats")
+    if any(not 0 <= value <= 1 for _, value in points):
+        raise ValueError("keyframe values must be between 0 and 100 percent")
+    return points
+
+
+class CompiledCurve:
+    """A ramp shape sampled once into a lookup table.
+
+    Maps the progression through a ramp (0 to 1) to the fraction of the
+    change applied. Evaluation is an index into the table plus a linear
+    interpolation, whatever the shape.
+    """
+
+    __slots__ = ("shape", "_table", "_last_index")
+
+    def __init__(self, shape: str, table: np.ndarray) -> None:
+        """Initialize the curve from its lookup table."""
+        self.shape = shape
+        self._table = table
+        self._last_index = len(table) - 1
+
+    @classmethod
+    def compile(cls, shape: str, keyframes: Optional[str] = None) -> "CompiledCurve":
+        """Sample a curve shape into a lookup table.
+
+        Raises:
+            ValueError: If the shape is unknown or the keyframes are malformed.
+        """
+        progression = np.linspace(0.0, 1.0, CURVE_TABLE_SIZE)
+        if shape == CURVE_LINEAR:
+            table = progression
+        elif shape == CURVE_SIGMOID:
+            logistic = 1.0 / (1.0 + np.exp(-SIGMOID_STEEPNESS * (progression - 0.5)))
+            table = (logistic - logistic[0]) / (logistic[-1] - logistic[0])
+        elif shape == CURVE_EASE_IN_OUT:
+            table = (1.0 - np.cos(np.pi * progression)) / 2.0
+        elif shape == CURVE_KEYFRAMES:
+            times, values = zip(*parse_keyframes(keyframes or ""))
+            table = np.interp(progression, times, values)
+        else:
+            raise ValueError(f"unknown curve shape {shape}")
+        return cls(shape, table)
+
+    def __call__(self, progression: np.ndarray) -> np.ndarray:
+        """Return the fraction of the change applied at each progression."""
+        position = np.clip(progression, 0.0, 1.0) * self._last_index
+        index = np.minimum(position.astype(np.intp), self._last_index - 1)
+        fraction = position - index
+        return self._table[index] + (self._table[index + 1] - self._table[index]) * fraction
+
+
+def ramp(
+    seconds_since_start: np.ndarray,
+    start_value: float,
+    end_value: float,
+    duration_seconds: float,
+    curve: CompiledCurve,
+) -> np.ndarray:
+    """Evaluate a ramp between two values for an array of offsets from its start."""
+    progression = seconds_since_start / duration_seconds
+    return start_value + (end_value - start_value) * curve(progression)
+
+
+# Phases in the order of their uint8 codes from sample_phases
+PHASE_CODES = (PHASE_NIGHT, PHASE_SUNRISE, PHASE_DAY, PHASE_SUNSET, PHASE_EVENING)
+
+
+def sample_lighting(
+    since_sunrise: np.ndarray,
+    since_sunset: np.ndarray,
+    brightness_range: Tuple[float, float],
+    color_temp_range: Tuple[float, float],
+    morning_seconds: float,
+    curve: CompiledCurve,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return brightness and color temperature for arrays of offsets from sunrise and adjusted sunset.
+
+    Values ramp from the maximum down to the minimum over the evening. With
+    a morning ramp, night values are held until sunrise and ramp back up.
+    """
+    min_brightness, max_brightness = brightness_range
+    min_color_temp, max_color_temp = color_temp_range
+    evening_seconds = EVENING_PHASE_HOURS * 3600
+    brightness = ramp(since_sunset, max_brightness, min_brightness, evening_seconds, curve)
+    color_temp = ramp(since_sunset, max_color_temp, min_color_temp, evening_seconds, curve)
+    
+    if morning_seconds:
+        before_sunset = since_sunset < 0
+        brightness = np.where(
+            before_sunset,
+            ramp(since_sunrise, min_brightness, max_brightness, morning_seconds, curve),
+            brightness,
+        )
+        color_temp = np.where(
+            before_sunset,
+            ramp(since_sunrise, min_color_temp, max_color_temp, morning_seconds, curve),
+            color_temp,
+        )
+    return brightness, color_temp
+
+
+def sample_phases(
+    since_sunrise: np.ndarray, since_sunset: np.ndarray, morning_seconds: float
+) -> np.ndarray:
+    """Return the index into PHASE_CODES for arrays of offsets from sunrise and adjusted sunset.
+
+    Uses the same boundaries as the coordinator's phase calculation.
+    """
+    sunrise_end = np.minimum(morning_seconds, since_sunrise - since_sunset)
+    return np.select(
+        [
+            since_sunrise < 0,
+            since_sunrise < sunrise_end,
+            since_sunset < 0,
+            since_sunset < SUNSET_PHASE_HOURS * 3600,
+            since_sunset < EVENING_PHASE_HOURS * 3600,
+        ],
+        [0, 1, 2, 3, 4],
+        0,
+    ).astype(np.uint8)
+
+
+@dataclass
+class DayCurve:
+    """Brightness and color temperature sampled at a fixed resolution.
+
+    Sample ``i`` holds the values at ``start + i * resolution``; values
+    between samples are linearly interpolated.
+    """
+
+    start: datetime
+    resolution: timedelta
+    brightness: np.ndarray
+    color_temp: np.ndarray
+    _brightness_steps: np.ndarray = field(init=False, repr=False)
+    _color_temp_steps: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the integer values reported to lights."""
+        self._brightness_steps = np.trunc(self.brightness)
+        self._color_temp_steps = np.trunc(self.color_temp)
+
+    @property
+    def end(self) -> datetime:
+        """Return the time of the last sample."""
+        return self.start + self.resolution * (len(self.brightness) - 1)
+
+    def covers(self, when: datetime) -> bool:
+        """Return True if a point in time lies within the sampled range."""
+        return self.start <= when <= self.end
+
+    def timestamps(self) -> np.ndarray:
+        """Return the POSIX timestamp of every sample."""
+        return self.start.timestamp() + np.arange(len(self.brightness)) * self.resolution.total_seconds()
+
+    def values_at(self, when: datetime) -> Tuple[float, float]:
+        """Return the interpolated brightness and color temperature at a point in time."""
+        position = (when - self.start) / self.resolution
+        index = min(max(int(position), 0), len(self.brightness) - 1)
+        if index == len(self.brightness) - 1:
+            return float(self.brightness[index]), float(self.color_temp[index])
+
+        fraction = min(max(position - index, 0.0), 1.0)
+        brightness = self.brightness[index] + (self.brightness[index + 1] - self.brightness[index]) * fraction
+        color_temp = self.color_temp[index] + (self.color_temp[index + 1] - self.color_temp[index]) * fraction
+        return float(brightness), float(color_temp)
+
+    def next_change(self, when: datetime) -> Optional[datetime]:
+        """Return the first sample after a point in time whose integer values differ."""
+        brightness, color_temp = self.values_at(when)
+        index = max(int((when - self.start) / self.resolution) + 1, 0)
+        changed = (self._brightness_steps[index:] != int(brightness)) | (
+            self._color_temp_steps[index:] != int(color_temp)
+        )
+        hits = np.flatnonzero(changed)
+        if not hits.size:
+            return None
+        return self.start + self.resolution * (index + int(hits[0]))
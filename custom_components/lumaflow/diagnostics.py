@@ -0,0 +1,38 @@
+"""Diagnostics support for LumaFlow."""
+
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import LumaFlowCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LumaFlowCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "state": {
+            "current_phase": data.get("current_phase"),
+            "lighting_values": data.get("lighting_values"),
+            "next_update": coordinator.next_update,
+            "lights_on": sorted(coordinator.lights_on),
+            "enabled_lights": sorted(coordinator.enabled_lights),
+            "overridden_lights": sorted(coordinator.overridden_lights),
+            "reconciling": coordinator.reconciling,
+        },
+        "capabilities": coordinator.capabilities.as_dict(),
+        "light_health": coordinator.dispatcher.health.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "command_trace": coordinator.dispatcher.trace.as_dict(),
+    }
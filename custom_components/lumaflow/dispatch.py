@@ -0,0 +1,278 @@
+"""Concurrent, batched light service dispatch for LumaFlow groups."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from homeassistant.core import Context, HomeAssistant
+
+from .applied_state import AppliedStateCache
+from .health import LightHealth
+from .const import DATA_PENDING, DATA_THROTTLE, DOMAIN, PRIORITY_BACKGROUND
+from .metrics import GroupMetrics
+from .pending import PendingCommands
+from .throttle import CommandThrottle
+from .trace import (
+    OUTCOME_FAILED,
+    OUTCOME_SENT,
+    OUTCOME_SKIPPED,
+    OUTCOME_SUPERSEDED,
+    OUTCOME_SUPPRESSED,
+    CommandTrace,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+LIGHT_DOMAIN = "light"
+SERVICE_TURN_ON = "turn_on"
+SERVICE_TURN_OFF = "turn_off"
+
+# Recent dispatch contexts kept to recognise echoes of our own commands
+MAX_TRACKED_CONTEXTS = 64
+
+
+@dataclass
+class DispatchResult:
+    """Outcome of dispatching one service to a set of lights."""
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    suppressed: List[str] = field(default_factory=list)
+    superseded: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+
+def payload_key(data: Dict[str, Any]) -> Hashable:
+    """Return a hashable key identifying a service data payload."""
+    return tuple(sorted((key, _freeze(value)) for key, value in data.items()))
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert lists and dicts in a payload into hashable equivalents."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return payload_key(value)
+    return value
+
+
+class LightDispatcher:
+    """Fan out light service calls concurrently with bounded parallelism.
+
+    Lights that share an identical payload are batched into a single
+    multi-entity service call, so the number of calls scales with the number
+    of distinct payloads rather than the number of lights. Turn-on commands
+    that would not change a light's device-level values are dropped. Calls
+    pass through the domain-wide command throttle, one batch per integration,
+    and are dropped for lights that a newer command has been queued for.
+    Lights that are unavailable or keep failing are skipped without a call.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        group_name: str,
+        max_concurrency: int,
+        call_timeout: float,
+        metrics: GroupMetrics,
+        debounce: float = 0.0,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._group_name = group_name
+        self._metrics = metrics
+        self.applied_states = AppliedStateCache()
+        self.trace = CommandTrace()
+        self.health = LightHealth()
+        self._contexts: "OrderedDict[str, None]" = OrderedDict()
+        self.configure(max_concurrency, call_timeout, debounce)
+
+    def configure(self, max_concurrency: int, call_timeout: float, debounce: float = 0.0) -> None:
+        """Update the concurrency limit, per-call timeout and background debounce."""
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._call_timeout = float(call_timeout)
+        self._debounce = float(debounce)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+    def is_own_context(self, context: Context) -> bool:
+        """Return True if a context originates from one of our dispatches."""
+        return context.id in self._contexts or (
+            context.parent_id is not None and context.parent_id in self._contexts
+        )
+
+    def _new_context(self, parent: Optional[Context] = None) -> Context:
+        """Create and remember a context for an outgoing dispatch."""
+        context = Context(parent_id=parent.id if parent is not None else None)
+        self._contexts[context.id] = None
+        if len(self._contexts) > MAX_TRACKED_CONTEXTS:
+            self._contexts.popitem(last=False)
+        return context
+
+    async def async_dispatch(
+        self,
+        service: str,
+        calls: Dict[str, Dict[str, Any]],
+        priority: int = PRIORITY_BACKGROUND,
+        parent: Optional[Context] = None,
+    ) -> DispatchResult:
+        """Call a light service for every light, one call per distinct payload.
+
+        Args:
+            service: Light service name, e.g. ``turn_on``.
+            calls: Service data keyed by light entity_id.
+            priority: Throttle priority, PRIORITY_USER for commands a user waits on.
+            parent: Context of the action that caused the dispatch, if any.
+
+        Returns:
+            Lights that succeeded and the error for each light that failed.
+        """
+        result = DispatchResult()
+        domain_data = self.hass.data.get(DOMAIN, {})
+        throttle: Optional[CommandThrottle] = domain_data.get(DATA_THROTTLE)
+        pending: Optional[PendingCommands] = domain_data.get(DATA_PENDING)
+
+        # Bucket lights by identical payload and integration, dropping no-op commands
+        buckets: Dict[Hashable, Tuple[Dict[str, Any], List[str], Optional[str]]] = {}
+        now = time.monotonic()
+        for light_id, data in calls.items():
+            if service == SERVICE_TURN_ON:
+                data = self.applied_states.diff(light_id, data)
+                if data is None:
+                    result.suppressed.append(light_id)
+                    continue
+            # Unavailable lights and open circuits never reach the service call
+            if not self.health.allow(light_id, now):
+                result.skipped.append(light_id)
+                continue
+            platform = throttle.platform_for(light_id) if throttle is not None else None
+            # Lights that failed recently get calls of their own, so failures are attributed to them
+            isolate = light_id if self.health.is_suspect(light_id) else None
+            buckets.setdefault((payload_key(data), platform, isolate), (data, [], platform))[1].append(light_id)
+
+        parent_id = parent.id if parent is not None else None
+        if result.suppressed:
+            _LOGGER.debug("Suppressed unchanged commands for %s", result.suppressed)
+            self.trace.record(service, result.suppressed, OUTCOME_SUPPRESSED, priority=priority, context_id=parent_id)
+        if result.skipped:
+            _LOGGER.debug("Skipped unavailable or failing lights %s", result.skipped)
+            self.trace.record(service, result.skipped, OUTCOME_SKIPPED, priority=priority, context_id=parent_id)
+            self._metrics.record_skipped(len(result.skipped))
+        if not buckets:
+            return result
+
+        context = self._new_context(parent)
+        origin = context.parent_id or context.id
+        batches = list(buckets.values())
+        started = time.perf_counter()
+        # User commands are never held back by the debounce
+        debounce = self._debounce if priority == PRIORITY_BACKGROUND else 0.0
+        outcomes = await asyncio.gather(
+            *(
+                self._async_send(service, light_ids, data, context, pending, throttle, platform, priority, debounce)
+                for data, light_ids, platform in batches
+            )
+        )
+        self._metrics.record_fanout(time.perf_counter() - started)
+
+        for (data, light_ids, _), (sent, error, latency) in zip(batches, outcomes):
+            if len(sent) < len(light_ids):
+                sent_set = set(sent)
+                superseded = [light_id for light_id in light_ids if light_id not in sent_set]
+                result.superseded.extend(superseded)
+                self.trace.record(
+                    service, superseded, OUTCOME_SUPERSEDED, data, priority=priority, context_id=origin
+                )
+            if not sent:
+                continue
+            self.trace.record(
+                service, sent, OUTCOME_SENT if error is None else OUTCOME_FAILED, data, latency, priority, origin
+            )
+            if error is None:
+                result.succeeded.extend(sent)
+                self.health.record_success(sent)
+            else:
+                result.failed.update(dict.fromkeys(sent, error))
+                self.health.record_failure(sent)
+            self._update_applied_states(service, sent, data, error)
+
+        if result.superseded:
+            self._metrics.record_superseded(len(result.superseded))
+
+        if result.failed:
+            _LOGGER.warning(
+                "Failed to %s %d of %d lights in LumaFlow group %s: %s",
+                service.replace("_", " "), len(result.failed), len(calls),
+                self._group_name, result.failed,
+            )
+        return result
+
+    def _update_applied_states(
+        self, service: str, light_ids: List[str], data: Dict[str, Any], error: Optional[str]
+    ) -> None:
+        """Keep the applied state cache in line with a finished call."""
+        if service == SERVICE_TURN_ON and error is None:
+            self.applied_states.record(light_ids, data)
+            return
+
+        # Turned off, or in an unknown state after a failure
+        for light_id in light_ids:
+            self.applied_states.invalidate(light_id)
+
+    async def _async_send(
+        self,
+        service: str,
+        light_ids: List[str],
+        data: Dict[str, Any],
+        context: Context,
+        pending: Optional[PendingCommands],
+        throttle: Optional[CommandThrottle],
+        platform: Optional[str],
+        priority: int,
+        debounce: float,
+    ) -> Tuple[List[str], Optional[str], Optional[float]]:
+        """Send a batch once it is its lights' turn.
+
+        Returns:
+            The lights sent to, the error if the call failed and how long the call took.
+        """
+        started = time.perf_counter()
+        if pending is None:
+            if throttle is not None:
+                await throttle.async_acquire(platform, len(light_ids), priority)
+                self._metrics.record_queue_wait(time.perf_counter() - started)
+            return (light_ids, *await self._async_call(service, light_ids, data, context))
+
+        async with pending.async_slot(light_ids, priority, throttle, platform, debounce) as lights:
+            self._metrics.record_queue_wait(time.perf_counter() - started)
+            if not lights:
+                return lights, None, None
+            return (lights, *await self._async_call(service, lights, data, context))
+
+    async def _async_call(
+        self, service: str, light_ids: List[str], data: Dict[str, Any], context: Context
+    ) -> Tuple[Optional[str], float]:
+        """Call the service once for a batch of lights, returning any error and the call duration."""
+        service_data = {"entity_id": light_ids, **data}
+        async with self._semaphore:
+            started = time.perf_counter()
+            error = None
+            try:
+                await asyncio.wait_for(
+                    self.hass.services.async_call(
+                        LIGHT_DOMAIN, service, service_data, blocking=True, context=context
+                    ),
+                    timeout=self._call_timeout,
+                )
+            except asyncio.TimeoutError:
+                error = f"timed out after {self._call_timeout:g}s"
+            except Exception as err:
+                error = str(err) or type(err).__name__
+            duration = time.perf_counter() - started
+            self._metrics.record_call(duration, error is not None, len(light_ids))
+
+        if error is None:
+            _LOGGER.debug("Called light.%s for %s: %s", service, light_ids, data)
+        return error, duration
@@ -0,0 +1,112 @@
+"""Per-light health of the lights controlled by a LumaFlow group."""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import State
+
+from .const import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_INITIAL_BACKOFF, CIRCUIT_MAX_BACKOFF
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive failures of one light and when to try it again."""
+
+    __slots__ = ("failures", "backoff", "retry_at")
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.failures = 0
+        self.backoff = 0.0
+        self.retry_at: Optional[float] = None
+
+
+class LightHealth:
+    """Skip lights that cannot take commands, so they cost nothing to dispatch.
+
+    Lights reporting themselves unavailable are skipped until their state
+    returns. A light failing CIRCUIT_FAILURE_THRESHOLD commands in a row
+    opens its circuit and is skipped until a retry, with the wait doubling
+    after every failed retry, or until it reports a new state.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with every light healthy."""
+        self._unavailable: Set[str] = set()
+        self._circuits: Dict[str, CircuitBreaker] = {}
+
+    def allow(self, light_id: str, now: Optional[float] = None) -> bool:
+        """Return True if a command should be sent to a light."""
+        if light_id in self._unavailable:
+            return False
+        circuit = self._circuits.get(light_id)
+        if circuit is None or circuit.retry_at is None:
+            return True
+
+        now = time.monotonic() if now is None else now
+        if now < circuit.retry_at:
+            return False
+        # Let this command through as the retry, and hold others until it fails
+        circuit.retry_at = now + circuit.backoff
+        return True
+
+    def is_suspect(self, light_id: str) -> bool:
+        """Return True if a light failed its last command."""
+        return light_id in self._circuits
+
+    def record_success(self, light_ids: Iterable[str]) -> None:
+        """Close the circuits of lights that took a command."""
+        for light_id in light_ids:
+            circuit = self._circuits.pop(light_id, None)
+            if circuit is not None and circuit.retry_at is not None:
+                _LOGGER.info("%s is responding again after %d failed commands", light_id, circuit.failures)
+
+    def record_failure(self, light_ids: Iterable[str], now: Optional[float] = None) -> None:
+        """Count a failed command, opening or backing off the circuits of the lights."""
+        now = time.monotonic() if now is None else now
+        for light_id in light_ids:
+            circuit = self._circuits.setdefault(light_id, CircuitBreaker())
+            circuit.failures += 1
+            if circuit.failures < CIRCUIT_FAILURE_THRESHOLD:
+                continue
+
+            if circuit.retry_at is None:
+                circuit.backoff = CIRCUIT_INITIAL_BACKOFF
+                _LOGGER.warning(
+                    "%s failed %d commands in a row, skipping it for %ds",
+                    light_id, circuit.failures, circuit.backoff,
+                )
+            else:
+                circuit.backoff = min(circuit.backoff * 2, CIRCUIT_MAX_BACKOFF)
+                _LOGGER.debug("%s still failing, next retry in %ds", light_id, circuit.backoff)
+            circuit.retry_at = now + circuit.backoff
+
+    def handle_state(self, light_id: str, state: Optional[State]) -> None:
+        """Update a light from its latest state."""
+        if state is None or state.state == STATE_UNAVAILABLE:
+            self._unavailable.add(light_id)
+            return
+
+        self._unavailable.discard(light_id)
+        # A new state means the light is reachable again
+        circuit = self._circuits.pop(light_id, None)
+        if circuit is not None and circuit.retry_at is not None:
+            _LOGGER.info("%s reported a new state, closing its circuit", light_id)
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Return unavailable lights and open circuits for diagnostics."""
+        now = time.monotonic() if now is None else now
+        return {
+            "unavailable": sorted(self._unavailable),
+            "circuits": {
+                light_id: {
+                    "failures": circuit.failures,
+                    "open": circuit.retry_at is not None,
+                    "retry_in": round(max(0.0, circuit.retry_at - now), 1) if circuit.retry_at is not None else None,
+                }
+                for light_id, circuit in self._circuits.items()
+            },
+        }
@@ -1,23 +1,28 @@
 """Light platform for LumaFlow - creates wrapper entities with circadian behavior."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from homeassistant.components.light import (
     LightEntity,
     ATTR_BRIGHTNESS,
     ATTR_COLOR_TEMP,
+    ATTR_COLOR_TEMP_KELVIN,
     ATTR_RGB_COLOR,
     ATTR_TRANSITION,
+    ATTR_XY_COLOR,
     ColorMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    DATA_ENTITIES,
     DOMAIN,
     CONF_LIGHTS,
     CONF_GROUP_NAME,
@@ -25,7 +30,13 @@ from .const import (
     ATTR_CURRENT_PHASE,
     ATTR_OVERRIDDEN,
     ATTR_CONTROLLED_LIGHTS,
+    ATTR_OVERRIDDEN_LIGHTS,
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    SIGNAL_GROUP_UPDATED,
 )
+from .capabilities import Bucket
+from .color import kelvin_to_rgb, kelvin_to_xy
 from .coordinator import LumaFlowCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -68,57 +79,28 @@ class LumaFlowLight(CoordinatorEntity[LumaFlowCoordinator], LightEntity):
         self._config_entry = config_entry
         self._group_name = group_name
         self._controlled_lights = controlled_lights
-        self._circadian_enabled = True
-        self._overridden = False
+        self._apply_task: Optional[asyncio.Task] = None
+        self._apply_pending = False
         
         # Entity naming: group_name_lumaflow
         self._attr_unique_id = f"{config_entry.entry_id}_{group_name}_lumaflow"
         self._attr_name = f"{group_name.title()} LumaFlow"
         self._attr_icon = "mdi:weather-sunset"
-        
-        # Determine supported color modes based on controlled lights
-        self._attr_supported_color_modes = self._determine_supported_color_modes()
-        self._attr_color_mode = self._get_preferred_color_mode()
-
-    def _determine_supported_color_modes(self) -> set[ColorMode]:
-        """Determine supported color modes from controlled lights."""
-        supported_modes = set()
-        
-        for light_id in self._controlled_lights:
-            light_state = self.hass.states.get(light_id)
-            if light_state:
-                light_modes = light_state.attributes.get("supported_color_modes", [])
-                for mode in light_modes:
-                    if mode == "color_temp":
-                        supported_modes.add(ColorMode.COLOR_TEMP)
-                    elif mode in ["rgb", "rgbw", "rgbww"]:
-                        supported_modes.add(ColorMode.RGB)
-                    elif mode == "brightness":
-                        supported_modes.add(ColorMode.BRIGHTNESS)
-        
-        # Always support brightness as minimum
-        if not supported_modes:
-            supported_modes.add(ColorMode.BRIGHTNESS)
-            
-        return supported_modes
-
-    def _get_preferred_color_mode(self) -> ColorMode:
-        """Get the preferred color mode for circadian lighting."""
-        if ColorMode.COLOR_TEMP in self._attr_supported_color_modes:
-            return ColorMode.COLOR_TEMP
-        elif ColorMode.RGB in self._attr_supported_color_modes:
-            return ColorMode.RGB
-        else:
-            return ColorMode.BRIGHTNESS
+
+    @property
+    def supported_color_modes(self) -> set[ColorMode]:
+        """Return the color modes of the controlled lights, as far as they have loaded."""
+        return self.coordinator.capabilities.supported_color_modes
+
+    @property
+    def color_mode(self) -> ColorMode:
+        """Return the preferred color mode for circadian lighting."""
+        return self.coordinator.capabilities.color_mode
 
     @property
     def is_on(self) -> bool:
         """Return true if any controlled light is on."""
-        for light_id in self._controlled_lights:
-            light_state = self.hass.states.get(light_id)
-            if light_state and light_state.state == "on":
-                return True
-        return False
+        return bool(self.coordinator.lights_on)
 
     @property
     def brightness(self) -> Optional[int]:
@@ -142,38 +124,34 @@ class LumaFlowLight(CoordinatorEntity[LumaFlowCoordinator], LightEntity):
     @property
     def rgb_color(self) -> Optional[tuple[int, int, int]]:
         """Return RGB color if using RGB mode."""
-        if self._attr_color_mode != ColorMode.RGB:
+        if self.color_mode != ColorMode.RGB:
             return None
         
-        # Convert color temp to RGB for circadian lighting
+        # Blackbody color of the circadian color temperature
         color_temp = self.color_temp
         if color_temp:
-            return self._color_temp_to_rgb(color_temp)
+            return kelvin_to_rgb(color_temp)
         return None
 
-    def _color_temp_to_rgb(self, color_temp: int) -> tuple[int, int, int]:
-        """Convert color temperature to RGB values."""
-        # Simplified color temp to RGB conversion for circadian lighting
-        if color_temp <= 3000:
-            # Warm white - more red/orange
-            return (255, 147, 41)
-        elif color_temp <= 4000:
-            # Neutral warm
-            return (255, 197, 143)
-        elif color_temp <= 5000:
-            # Neutral
-            return (255, 214, 170)
-        else:
-            # Cool white - more blue
-            return (255, 244, 229)
+    @property
+    def xy_color(self) -> Optional[tuple[float, float]]:
+        """Return CIE xy color if using XY mode."""
+        if self.color_mode != ColorMode.XY:
+            return None
+        
+        color_temp = self.color_temp
+        if color_temp:
+            return kelvin_to_xy(color_temp)
+        return None
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return extra state attributes."""
         attributes = {
-            ATTR_CIRCADIAN_ENABLED: self._circadian_enabled,
+            ATTR_CIRCADIAN_ENABLED: self.coordinator.circadian_enabled,
             ATTR_CONTROLLED_LIGHTS: self._controlled_lights,
-            ATTR_OVERRIDDEN: self._overridden,
+            ATTR_OVERRIDDEN: self.coordinator.overridden,
+            ATTR_OVERRIDDEN_LIGHTS: sorted(self.coordinator.overridden_lights),
         }
         
         if self.coordinator.data:
@@ -193,101 +171,257 @@ class LumaFlowLight(CoordinatorEntity[LumaFlowCoordinator], LightEntity):
         if self.coordinator.data:
             lighting_values = self.coordinator.data.get("lighting_values", {})
         
-        # Prepare service data with circadian values as defaults
+        # Get enabled lights from switches
+        enabled_lights = self._get_enabled_lights()
+        
+        # Turn on only enabled controlled lights with circadian values as defaults
+        calls = self._build_light_calls(enabled_lights, lighting_values, kwargs)
+        await self._turn_on_controlled_lights(calls, PRIORITY_USER, self._context)
+        self.coordinator.async_record_applied_values(lighting_values)
+        
+        current_phase = self.coordinator.data.get("current_phase", "unknown") if self.coordinator.data else "unknown"
+        _LOGGER.info("LumaFlow light %s turned on with circadian values for phase '%s': %s", 
+                    self.name, current_phase, lighting_values)
+
+    def _build_light_calls(
+        self, light_ids: Iterable[str], lighting_values: Dict[str, Any], kwargs: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Build service data for each light, shaped to what the light supports.
+        
+        Lights are bucketed by color mode and transition support, and each
+        bucket shares one payload that the dispatcher sends as a single call.
+        """
+        payloads: Dict[Bucket, Dict[str, Any]] = {}
+        calls = {}
+        for light_id in light_ids:
+            bucket = self.coordinator.capabilities.bucket(light_id)
+            if bucket not in payloads:
+                payloads[bucket] = self._build_service_data(lighting_values, kwargs, *bucket)
+            calls[light_id] = payloads[bucket]
+        return calls
+
+    def _build_service_data(
+        self,
+        lighting_values: Dict[str, Any],
+        kwargs: Dict[str, Any],
+        color_mode: ColorMode,
+        supports_transition: bool = True,
+        min_kelvin: Optional[int] = None,
+        max_kelvin: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build light service data for one color mode from circadian values and user overrides."""
         service_data = {}
         
+        # On/off lights can only be turned on
+        if color_mode == ColorMode.ONOFF:
+            return service_data
+        
         # Apply circadian values first, then override with any user-provided values
         if lighting_values.get("brightness") and ATTR_BRIGHTNESS not in kwargs:
             service_data["brightness_pct"] = lighting_values["brightness"]
         elif ATTR_BRIGHTNESS in kwargs:
             service_data["brightness"] = kwargs[ATTR_BRIGHTNESS]
         
-        if (lighting_values.get("color_temp") and 
-            ColorMode.COLOR_TEMP in self._attr_supported_color_modes and 
-            ATTR_COLOR_TEMP not in kwargs):
-            service_data["color_temp"] = lighting_values["color_temp"]
-        elif ATTR_COLOR_TEMP in kwargs:
-            service_data["color_temp"] = kwargs[ATTR_COLOR_TEMP]
+        # Brightness-only lights get no color attributes at all
+        if color_mode != ColorMode.BRIGHTNESS:
+            if (lighting_values.get("color_temp") and 
+                color_mode == ColorMode.COLOR_TEMP and 
+                ATTR_COLOR_TEMP not in kwargs):
+                # Stay within what the bulb supports
+                kelvin = lighting_values["color_temp"]
+                if min_kelvin is not None:
+                    kelvin = max(kelvin, min_kelvin)
+                if max_kelvin is not None:
+                    kelvin = min(kelvin, max_kelvin)
+                service_data[ATTR_COLOR_TEMP_KELVIN] = kelvin
+            elif ATTR_COLOR_TEMP in kwargs:
+                service_data["color_temp"] = kwargs[ATTR_COLOR_TEMP]
+            elif lighting_values.get("color_temp") and ATTR_RGB_COLOR not in kwargs:
+                # Lights without color temperature get the matching blackbody color
+                if color_mode == ColorMode.RGB:
+                    service_data[ATTR_RGB_COLOR] = kelvin_to_rgb(lighting_values["color_temp"])
+                elif color_mode == ColorMode.XY:
+                    service_data[ATTR_XY_COLOR] = kelvin_to_xy(lighting_values["color_temp"])
+            
+            if ATTR_RGB_COLOR in kwargs:
+                service_data["rgb_color"] = kwargs[ATTR_RGB_COLOR]
+        
+        if supports_transition:
+            if ATTR_TRANSITION in kwargs:
+                service_data["transition"] = kwargs[ATTR_TRANSITION]
+            elif lighting_values.get("transition"):
+                service_data["transition"] = lighting_values["transition"]
+        
+        return service_data
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        super()._handle_coordinator_update()
+        
+        if not self.coordinator.circadian_enabled or self.coordinator.overridden:
+            return
+        
+        # The startup reconciliation applies the first values in waves
+        if self.coordinator.reconciling:
+            return
+        
+        # Replay the latest values once a previous application finishes
+        if self._apply_task is not None and not self._apply_task.done():
+            self._apply_pending = True
+            return
+        self._apply_task = self.hass.async_create_task(self._async_apply_circadian())
+
+    async def _async_apply_circadian(self) -> None:
+        """Push current circadian values once they moved past the change thresholds."""
+        while True:
+            self._apply_pending = False
+            await self._async_apply_latest()
+            # Updates that arrived meanwhile carry newer values, e.g. the end of a phase
+            if not self._apply_pending or not self.coordinator.circadian_enabled or self.coordinator.overridden:
+                self._apply_pending = False
+                return
+
+    async def _async_apply_latest(self) -> None:
+        """Apply the current coordinator data if it moved past the change thresholds."""
+        if not self.coordinator.data:
+            return
+        
+        lighting_values = self.coordinator.data.get("lighting_values", {})
+        if not self._should_apply(lighting_values):
+            return
+        
+        if await self.async_apply_circadian():
+            self.coordinator.async_record_applied_values(lighting_values)
+
+    async def async_apply_circadian(
+        self, light_ids: Optional[Iterable[str]] = None, priority: int = PRIORITY_BACKGROUND
+    ) -> List[str]:
+        """Apply current circadian values to enabled lights that are on and not overridden.
         
-        if ATTR_RGB_COLOR in kwargs:
-            service_data["rgb_color"] = kwargs[ATTR_RGB_COLOR]
+        Args:
+            light_ids: Limit the application to these lights. Defaults to the whole group.
+            priority: Command throttle priority, PRIORITY_USER when a user is waiting.
             
-        if ATTR_TRANSITION in kwargs:
-            service_data["transition"] = kwargs[ATTR_TRANSITION]
-        elif lighting_values.get("transition"):
-            service_data["transition"] = lighting_values["transition"]
+        Returns:
+            The lights the values were sent to.
+        """
+        if not self.coordinator.data:
+            return []
         
-        # Get enabled lights from switches
-        enabled_lights = await self._get_enabled_lights()
+        if light_ids is None:
+            candidates = self._get_enabled_lights()
+        else:
+            # Only look at the requested lights, not the whole group
+            enabled_lights = self.coordinator.enabled_lights
+            candidates = [light_id for light_id in dict.fromkeys(light_ids) if light_id in enabled_lights]
         
-        # Turn on only enabled controlled lights with circadian values
-        await self._turn_on_controlled_lights(enabled_lights, **service_data)
+        targets = [
+            light_id for light_id in candidates
+            if light_id in self.coordinator.lights_on and light_id not in self.coordinator.overridden_lights
+        ]
+        if not targets:
+            return []
         
-        current_phase = self.coordinator.data.get("current_phase", "unknown") if self.coordinator.data else "unknown"
-        _LOGGER.info("LumaFlow light %s turned on with circadian values for phase '%s': %s", 
-                    self.name, current_phase, service_data)
+        lighting_values = self.coordinator.data.get("lighting_values", {})
+        await self._turn_on_controlled_lights(self._build_light_calls(targets, lighting_values, {}), priority)
+        
+        _LOGGER.debug("LumaFlow light %s applied circadian values to %s: %s",
+                     self.name, targets, lighting_values)
+        return targets
+
+    def needs_reconcile(self) -> bool:
+        """Return True if the lights may be behind the current circadian values after a restart."""
+        if not self.coordinator.data or not self.coordinator.circadian_enabled or self.coordinator.overridden:
+            return False
+        return self._should_apply(self.coordinator.data.get("lighting_values", {}))
+
+    def _should_apply(self, lighting_values: Dict[str, Any]) -> bool:
+        """Return True if values moved past the configured change thresholds."""
+        last_values = self.coordinator.last_applied_values
+        if last_values is None:
+            return True
+        
+        # Always land on the final values of a phase, even for small steps
+        current_phase = self.coordinator.data.get("current_phase")
+        if current_phase != self.coordinator.last_applied_phase:
+            return lighting_values != last_values
+        
+        brightness_delta = abs(lighting_values.get("brightness", 0) - last_values.get("brightness", 0))
+        color_temp_delta = abs(lighting_values.get("color_temp", 0) - last_values.get("color_temp", 0))
+        return (
+            brightness_delta >= self.coordinator.brightness_threshold
+            or color_temp_delta >= self.coordinator.color_temp_threshold
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity and refresh attributes when group runtime state changes."""
+        await super().async_added_to_hass()
+        
+        # Let services resolve this entity directly
+        entities: Dict[str, LumaFlowLight] = self.hass.data[DOMAIN].setdefault(DATA_ENTITIES, {})
+        entities[self.entity_id] = self
+        self.coordinator.light_entity = self
+        
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_GROUP_UPDATED.format(self._config_entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister the entity and cancel any in-flight circadian application."""
+        self.hass.data[DOMAIN].get(DATA_ENTITIES, {}).pop(self.entity_id, None)
+        if self.coordinator.light_entity is self:
+            self.coordinator.light_entity = None
+        
+        if self._apply_task is not None and not self._apply_task.done():
+            self._apply_task.cancel()
+        await super().async_will_remove_from_hass()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off all controlled lights."""
-        for light_id in self._controlled_lights:
-            try:
-                await self.hass.services.async_call(
-                    "light", "turn_off", 
-                    {"entity_id": light_id, **kwargs}, 
-                    blocking=True
-                )
-            except Exception as err:
-                _LOGGER.warning("Failed to turn off light %s: %s", light_id, err)
+        await self.coordinator.dispatcher.async_dispatch(
+            "turn_off", {light_id: dict(kwargs) for light_id in self._controlled_lights}, PRIORITY_USER, self._context
+        )
         
         _LOGGER.info("LumaFlow light %s turned off", self.name)
 
-    async def _get_enabled_lights(self) -> list[str]:
+    def _get_enabled_lights(self) -> list[str]:
         """Get list of enabled lights from individual switches."""
-        enabled_lights = []
-        
-        # Check each light's individual switch state
-        for light_id in self._controlled_lights:
-            switch_entity_id = f"switch.{light_id.replace('.', '_').replace('light_', '')}_lumaflow"
-            switch_state = self.hass.states.get(switch_entity_id)
-            
-            # Default to enabled if switch doesn't exist yet
-            if switch_state is None or switch_state.state == "on":
-                enabled_lights.append(light_id)
-            else:
-                _LOGGER.debug("Skipping disabled light: %s", light_id)
-        
-        return enabled_lights
-
-    async def _turn_on_controlled_lights(self, lights_to_control: list[str], **kwargs: Any) -> None:
-        """Turn on specified controlled lights with given parameters."""
-        for light_id in lights_to_control:
-            service_data = {"entity_id": light_id, **kwargs}
-            
-            try:
-                await self.hass.services.async_call(
-                    "light", "turn_on", service_data, blocking=True
-                )
-                _LOGGER.debug("Applied circadian values to %s: %s", light_id, service_data)
-            except Exception as err:
-                _LOGGER.warning("Failed to turn on light %s: %s", light_id, err)
+        enabled_lights = self.coordinator.enabled_lights
+        return [light_id for light_id in self._controlled_lights if light_id in enabled_lights]
+
+    async def _turn_on_controlled_lights(
+        self, calls: Dict[str, Dict[str, Any]], priority: int, parent: Optional[Context] = None
+    ) -> None:
+        """Turn on controlled lights, each with its own service data."""
+        result = await self.coordinator.dispatcher.async_dispatch("turn_on", calls, priority, parent)
+        _LOGGER.debug("Applied circadian values to %s", result.succeeded)
 
     @callback
     def enable_circadian(self) -> None:
         """Enable circadian behavior for this light."""
-        self._circadian_enabled = True
-        self._overridden = False
+        self.coordinator.circadian_enabled = True
+        self.coordinator.overridden = False
+        # Also saves the state
+        self.coordinator.async_clear_overrides()
         _LOGGER.info("Circadian enabled for %s", self.name)
 
     @callback
     def disable_circadian(self) -> None:
         """Disable circadian behavior for this light."""
-        self._circadian_enabled = False
+        self.coordinator.circadian_enabled = False
+        self.coordinator.async_save_state()
         _LOGGER.info("Circadian disabled for %s", self.name)
 
     @callback
     def set_override(self, overridden: bool = True) -> None:
         """Mark this light as manually overridden."""
-        self._overridden = overridden
+        self.coordinator.overridden = overridden
+        self.coordinator.async_save_state()
         if overridden:
             _LOGGER.debug("Light %s marked as overridden", self.name)
         else:
@@ -301,4 +435,4 @@ class LumaFlowLight(CoordinatorEntity[LumaFlowCoordinator], LightEntity):
             "name": f"LumaFlow {self._group_name.title()}",
             "manufacturer": "LumaFlow",
             "entry_type": "service",
-        } 
\ No newline at end of file
+        }
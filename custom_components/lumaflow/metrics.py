@@ -0,0 +1,145 @@
+"""Bounded runtime metrics for LumaFlow groups."""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .const import METRICS_RATE_MINUTES, METRICS_WINDOW_SIZE
+
+
+class RollingWindow:
+    """The most recent samples of a measurement, in a fixed-size ring."""
+
+    def __init__(self, size: int = METRICS_WINDOW_SIZE) -> None:
+        """Initialize the window."""
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.total = 0
+
+    def add(self, value: float) -> None:
+        """Record a sample, dropping the oldest once the window is full."""
+        self._samples.append(value)
+        self.total += 1
+
+    @property
+    def last(self) -> Optional[float]:
+        """Return the most recent sample."""
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return a percentile of the samples in the window."""
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, float), percent))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return last, p50, p95 and max of the window, rounded for display."""
+        if not self._samples:
+            return {"count": 0, "last": None, "p50": None, "p95": None, "max": None}
+        samples = np.fromiter(self._samples, float)
+        p50, p95 = np.percentile(samples, [50, 95])
+        return {
+            "count": self.total,
+            "last": round(self._samples[-1], 2),
+            "p50": round(float(p50), 2),
+            "p95": round(float(p95), 2),
+            "max": round(float(samples.max()), 2),
+        }
+
+
+class RateCounter:
+    """Event counts in per-minute buckets over a fixed number of minutes."""
+
+    def __init__(self, minutes: int = METRICS_RATE_MINUTES, now: Optional[float] = None) -> None:
+        """Initialize the counter."""
+        self._minutes = minutes
+        self._buckets: Deque[List[int]] = deque(maxlen=minutes)
+        self._start_minute = int((time.monotonic() if now is None else now) // 60)
+        self.total = 0
+
+    def add(self, count: int = 1, now: Optional[float] = None) -> None:
+        """Count events in the current minute."""
+        minute = int((time.monotonic() if now is None else now) // 60)
+        if self._buckets and self._buckets[-1][0] == minute:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([minute, count])
+        self.total += count
+
+    def per_minute(self, now: Optional[float] = None) -> float:
+        """Return the average events per minute over the window, or since start if shorter."""
+        minute = int((time.monotonic() if now is None else now) // 60)
+        recent = sum(count for bucket, count in self._buckets if bucket > minute - self._minutes)
+        minutes = min(self._minutes, minute - self._start_minute + 1)
+        return round(recent / max(1, minutes), 2)
+
+
+class GroupMetrics:
+    """Timing and throughput of one LumaFlow group."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.update_duration = RollingWindow()
+        self.fanout_duration = RollingWindow()
+        self.call_latency = RollingWindow()
+        self.queue_wait = RollingWindow()
+        self.commands = RateCounter()
+        self.failures = RateCounter()
+        self.superseded = RateCounter()
+        self.skipped = RateCounter()
+        self._listeners: List[Callable[[], None]] = []
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call back after every update and dispatch, returning a function to stop."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def _notify(self) -> None:
+        """Tell listeners that new samples were recorded."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def record_update(self, seconds: float) -> None:
+        """Record how long a coordinator update took."""
+        self.update_duration.add(seconds * 1000)
+        self._notify()
+
+    def record_fanout(self, seconds: float) -> None:
+        """Record the wall time of one dispatch to the group's lights, once its calls are recorded."""
+        self.fanout_duration.add(seconds * 1000)
+        self._notify()
+
+    def record_queue_wait(self, seconds: float) -> None:
+        """Record how long a call waited for its turn and the command rate limit."""
+        self.queue_wait.add(seconds * 1000)
+
+    def record_superseded(self, count: int) -> None:
+        """Count light commands dropped because a newer one replaced them."""
+        self.superseded.add(count)
+
+    def record_skipped(self, count: int) -> None:
+        """Count light commands skipped because the light is unavailable or failing."""
+        self.skipped.add(count)
+
+    def record_call(self, seconds: float, failed: bool, lights: int = 1) -> None:
+        """Record one light service call, counting a command for every light in it."""
+        self.call_latency.add(seconds * 1000)
+        self.commands.add(lights)
+        if failed:
+            self.failures.add(lights)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a snapshot of all metrics."""
+        return {
+            "update_duration_ms": self.update_duration.summary(),
+            "fanout_duration_ms": self.fanout_duration.summary(),
+            "call_latency_ms": self.call_latency.summary(),
+            "queue_wait_ms": self.queue_wait.summary(),
+            "commands_per_minute": self.commands.per_minute(),
+            "failures_per_minute": self.failures.per_minute(),
+            "commands_total": self.commands.total,
+            "failures_total": self.failures.total,
+            "superseded_total": self.superseded.total,
+            "skipped_total": self.skipped.total,
+        }
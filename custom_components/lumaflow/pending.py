@@ -0,0 +1,121 @@
+"""Domain-wide last-write-wins slots for commands to LumaFlow lights."""
+
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import PRIORITY_BACKGROUND
+from .throttle import CommandThrottle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PendingCommands:
+    """Keep at most one in-flight and one pending command per light.
+
+    Every command claims the pending slot of its lights. A newer command
+    replaces an older one that has not been sent yet, except that
+    background commands never replace a pending user command. Commands
+    only go out once the previous command to the same light has finished.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the slots."""
+        self.hass = hass
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._tokens = itertools.count()
+
+    @asynccontextmanager
+    async def async_slot(
+        self,
+        light_ids: List[str],
+        priority: int = PRIORITY_BACKGROUND,
+        throttle: Optional[CommandThrottle] = None,
+        platform: Optional[str] = None,
+        debounce: float = 0.0,
+    ) -> AsyncIterator[List[str]]:
+        """Wait for the turn of a command and hold its lights while it is sent.
+
+        Args:
+            light_ids: Lights the command is for.
+            priority: PRIORITY_USER or PRIORITY_BACKGROUND.
+            throttle: Command rate limit to wait for before sending.
+            platform: Integration of the lights, for the rate limit.
+            debounce: Seconds to wait first, so a newer command can replace this one.
+
+        Yields:
+            The lights the command should still be sent to, which may be none.
+        """
+        token = next(self._tokens)
+        claimed = self._claim(token, light_ids, priority)
+        lights: List[str] = []
+        in_flight: Optional[asyncio.Future] = None
+        try:
+            if claimed and debounce:
+                await asyncio.sleep(debounce)
+            lights = await self._async_wait_turn(token, claimed)
+            if lights and throttle is not None:
+                await throttle.async_acquire(platform, len(lights), priority)
+                lights = self._current(token, lights)
+            if lights:
+                in_flight = self._start(token, lights)
+            if len(lights) < len(light_ids):
+                _LOGGER.debug("Dropped commands replaced by newer ones for %s", set(light_ids) - set(lights))
+            yield lights
+        finally:
+            self._release(token, claimed, lights if in_flight is not None else [], in_flight)
+
+    def _claim(self, token: int, light_ids: List[str], priority: int) -> List[str]:
+        """Make a command the pending one for its lights, returning the lights it won."""
+        claimed = []
+        for light_id in light_ids:
+            pending = self._pending.get(light_id)
+            if pending is not None and pending[1] < priority:
+                continue
+            self._pending[light_id] = (token, priority)
+            claimed.append(light_id)
+        return claimed
+
+    def _current(self, token: int, light_ids: List[str]) -> List[str]:
+        """Return the lights a command is still the pending one for."""
+        return [
+            light_id for light_id in light_ids
+            if (pending := self._pending.get(light_id)) is not None and pending[0] == token
+        ]
+
+    async def _async_wait_turn(self, token: int, light_ids: List[str]) -> List[str]:
+        """Wait until no earlier command to the lights is in flight."""
+        while True:
+            lights = self._current(token, light_ids)
+            busy = {self._in_flight[light_id] for light_id in lights if light_id in self._in_flight}
+            if not busy:
+                return lights
+            # Wait without cancelling the other command's future
+            await asyncio.wait(busy)
+
+    def _start(self, token: int, light_ids: List[str]) -> asyncio.Future:
+        """Move a command from pending to in flight for its lights."""
+        future = self.hass.loop.create_future()
+        for light_id in light_ids:
+            del self._pending[light_id]
+            self._in_flight[light_id] = future
+        return future
+
+    def _release(
+        self, token: int, claimed: List[str], sent: List[str], in_flight: Optional[asyncio.Future]
+    ) -> None:
+        """Free the slots of a finished, dropped or cancelled command."""
+        for light_id in claimed:
+            pending = self._pending.get(light_id)
+            if pending is not None and pending[0] == token:
+                del self._pending[light_id]
+        for light_id in sent:
+            if self._in_flight.get(light_id) is in_flight:
+                del self._in_flight[light_id]
+        if in_flight is not None:
+            in_flight.set_result(None)
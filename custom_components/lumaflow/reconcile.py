@@ -0,0 +1,142 @@
+"""Domain-wide reconciliation of LumaFlow groups after a restart."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.start import async_at_started
+
+from .const import STARTUP_AVAILABILITY_TIMEOUT
+
+if TYPE_CHECKING:
+    from .coordinator import LumaFlowCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _is_available(state: Optional[State]) -> bool:
+    """Return True if a light has loaded and reports a usable state."""
+    return state is not None and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+
+
+class StartupReconciler:
+    """Bring every group up to date after a restart, a few lights at a time.
+
+    Once Home Assistant has started, groups are taken in order of their
+    startup priority. Each group waits for its member lights to load, then
+    gets its circadian values in waves of a configured size and spacing,
+    so a restart does not send a command to every light at once. Groups
+    skip their regular background updates until they have been reconciled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the reconciler."""
+        self.hass = hass
+        self._queue: List[Tuple[int, int, "LumaFlowCoordinator"]] = []
+        self._sequence = itertools.count()
+        self._unsub_start: Optional[Callable[[], None]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._deadline: Optional[float] = None
+        self._sent_wave = False
+
+    @callback
+    def async_add_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Queue a group for reconciliation once Home Assistant has started."""
+        coordinator.reconciling = True
+        heapq.heappush(self._queue, (coordinator.startup_priority, next(self._sequence), coordinator))
+        if self._unsub_start is None and self._task is None:
+            unsub = async_at_started(self.hass, self._async_start)
+            # Runs right away if Home Assistant is already running
+            if self._task is None:
+                self._unsub_start = unsub
+
+    @callback
+    def async_remove_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Drop a group that is unloaded before it was reconciled."""
+        coordinator.reconciling = False
+        self._queue = [item for item in self._queue if item[2] is not coordinator]
+        heapq.heapify(self._queue)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel a reconciliation that has not finished."""
+        if self._unsub_start is not None:
+            self._unsub_start()
+            self._unsub_start = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+
+    @callback
+    def _async_start(self, hass: HomeAssistant) -> None:
+        """Start reconciling the queued groups."""
+        self._unsub_start = None
+        self._deadline = hass.loop.time() + STARTUP_AVAILABILITY_TIMEOUT
+        self._sent_wave = False
+        self._task = hass.async_create_background_task(self._async_run(), "lumaflow startup reconciliation")
+
+    async def _async_run(self) -> None:
+        """Reconcile groups in priority order until the queue is empty."""
+        try:
+            while self._queue:
+                _, _, coordinator = heapq.heappop(self._queue)
+                try:
+                    await self._async_reconcile_group(coordinator)
+                except Exception as err:
+                    _LOGGER.error("Startup reconciliation of %s failed: %s", coordinator.group_name, err)
+                finally:
+                    coordinator.reconciling = False
+        finally:
+            self._task = None
+
+    async def _async_reconcile_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Wait for a group's lights and apply its circadian values in waves."""
+        await self._async_wait_for_lights(coordinator.controlled_lights)
+
+        light = coordinator.light_entity
+        if light is None or not light.needs_reconcile():
+            _LOGGER.debug("%s is already up to date after startup", coordinator.group_name)
+            return
+
+        # Lights that are off get their values when they are turned on
+        targets = [light_id for light_id in coordinator.controlled_lights if light_id in coordinator.lights_on]
+        wave_size = max(1, coordinator.startup_wave_size)
+        for start in range(0, len(targets), wave_size):
+            if self._sent_wave:
+                await asyncio.sleep(coordinator.startup_wave_spacing)
+            sent = await light.async_apply_circadian(targets[start:start + wave_size])
+            self._sent_wave = self._sent_wave or bool(sent)
+
+        if coordinator.data:
+            coordinator.async_record_applied_values(coordinator.data.get("lighting_values", {}))
+        _LOGGER.debug("Reconciled %d lights of %s after startup", len(targets), coordinator.group_name)
+
+    async def _async_wait_for_lights(self, light_ids: Iterable[str]) -> None:
+        """Wait until lights have loaded, up to the shared startup deadline."""
+        missing = {light_id for light_id in light_ids if not _is_available(self.hass.states.get(light_id))}
+        if not missing:
+            return
+
+        loaded = asyncio.Event()
+
+        @callback
+        def _async_state_changed(event: Event) -> None:
+            if _is_available(event.data.get("new_state")):
+                missing.discard(event.data["entity_id"])
+                if not missing:
+                    loaded.set()
+
+        unsub = async_track_state_change_event(self.hass, list(missing), _async_state_changed)
+        try:
+            timeout = max(0.0, self._deadline - self.hass.loop.time()) if self._deadline else 0.0
+            await asyncio.wait_for(loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Lights still unavailable after startup, not waiting for them: %s", sorted(missing))
+        finally:
+            unsub()
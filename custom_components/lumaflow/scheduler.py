@@ -0,0 +1,107 @@
+"""Domain-wide clock driving every LumaFlow group."""
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+if TYPE_CHECKING:
+    from .coordinator import LumaFlowCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LumaFlowScheduler:
+    """Evaluate all groups from a single timer.
+
+    Only one timer is armed at a time, for the earliest next_update of any
+    group. When it fires, every group that is due is evaluated in one pass
+    and only the groups whose values changed notify their listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._groups: Dict[str, "LumaFlowCoordinator"] = {}
+        self._unsub_listeners: Dict[str, Callable[[], None]] = {}
+        self._unsub_timer: Optional[Callable[[], None]] = None
+        self._next_tick: Optional[datetime] = None
+        self._ticking = False
+
+    @callback
+    def async_add_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Start driving a group."""
+        entry_id = coordinator.entry.entry_id
+        self._groups[entry_id] = coordinator
+        # Explicit refreshes (options, services) move next_update too
+        self._unsub_listeners[entry_id] = coordinator.async_add_listener(self._async_schedule)
+        self._async_schedule()
+
+    @callback
+    def async_remove_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Stop driving a group."""
+        entry_id = coordinator.entry.entry_id
+        self._groups.pop(entry_id, None)
+        unsub = self._unsub_listeners.pop(entry_id, None)
+        if unsub is not None:
+            unsub()
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer and drop all groups."""
+        self._async_cancel_timer()
+        for unsub in self._unsub_listeners.values():
+            unsub()
+        self._unsub_listeners.clear()
+        self._groups.clear()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the pending tick, if any."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._next_tick = None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Arm the timer for the earliest update any group needs."""
+        if self._ticking:
+            # Rescheduled once the current pass is done
+            return
+
+        next_tick = min(
+            (group.next_update for group in self._groups.values() if group.next_update),
+            default=None,
+        )
+        if next_tick == self._next_tick:
+            return
+
+        self._async_cancel_timer()
+        if next_tick is None:
+            return
+        self._unsub_timer = async_track_point_in_utc_time(self.hass, self._async_tick, next_tick)
+        self._next_tick = next_tick
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Evaluate every due group, then re-arm the timer."""
+        self._unsub_timer = None
+        self._next_tick = None
+
+        self._ticking = True
+        try:
+            due = [
+                group for group in self._groups.values()
+                if group.next_update is None or group.next_update <= now
+            ]
+            for group in due:
+                group.async_tick(now)
+        finally:
+            self._ticking = False
+
+        _LOGGER.debug("Evaluated %d of %d LumaFlow groups", len(due), len(self._groups))
+        self._async_schedule()
@@ -1,17 +1,27 @@
 """Sensor platform for LumaFlow."""
 
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
+    METRICS_RATE_REFRESH,
+    METRICS_WRITE_INTERVAL,
     SENSOR_CURRENT_PHASE,
     SENSOR_NEXT_TRANSITION,
     PHASE_DAY,
@@ -21,9 +31,63 @@ from .const import (
     PHASE_SUNRISE,
 )
 from .coordinator import LumaFlowCoordinator
+from .metrics import GroupMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass
+class LumaFlowMetricSensorDescription(SensorEntityDescription):
+    """Describes a LumaFlow runtime metric sensor."""
+
+    value_fn: Callable[[GroupMetrics], Optional[float]] = lambda metrics: None
+    attributes_fn: Optional[Callable[[GroupMetrics], Dict[str, Any]]] = None
+    # Seconds between refreshes while nonzero, for rates that decay without new samples
+    refresh_interval: Optional[float] = None
+
+
+METRIC_SENSORS = (
+    LumaFlowMetricSensorDescription(
+        key="update_duration",
+        name="Update Duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics: metrics.update_duration.last,
+        attributes_fn=lambda metrics: metrics.update_duration.summary(),
+    ),
+    LumaFlowMetricSensorDescription(
+        key="fanout_duration",
+        name="Fan-out Duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics: metrics.fanout_duration.last,
+        attributes_fn=lambda metrics: metrics.fanout_duration.summary(),
+    ),
+    LumaFlowMetricSensorDescription(
+        key="call_latency",
+        name="Call Latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics: metrics.call_latency.percentile(95),
+        attributes_fn=lambda metrics: metrics.call_latency.summary(),
+    ),
+    LumaFlowMetricSensorDescription(
+        key="commands_per_minute",
+        name="Commands Per Minute",
+        icon="mdi:send-outline",
+        value_fn=lambda metrics: metrics.commands.per_minute(),
+        attributes_fn=lambda metrics: {"total": metrics.commands.total},
+        refresh_interval=METRICS_RATE_REFRESH,
+    ),
+    LumaFlowMetricSensorDescription(
+        key="failures_per_minute",
+        name="Failures Per Minute",
+        icon="mdi:alert-circle-outline",
+        value_fn=lambda metrics: metrics.failures.per_minute(),
+        attributes_fn=lambda metrics: {"total": metrics.failures.total},
+        refresh_interval=METRICS_RATE_REFRESH,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,6 +100,10 @@ async def async_setup_entry(
     async_add_entities([
         LumaFlowCurrentPhaseSensor(coordinator, config_entry),
         LumaFlowNextTransitionSensor(coordinator, config_entry),
+        *(
+            LumaFlowMetricSensor(coordinator, config_entry, description)
+            for description in METRIC_SENSORS
+        ),
     ])
 
 
@@ -131,7 +199,7 @@ class LumaFlowNextTransitionSensor(CoordinatorEntity[LumaFlowCoordinator], Senso
         elif current_phase == PHASE_NIGHT:
             return sun_times.get("sunrise")
         elif current_phase == PHASE_SUNRISE:
-            return sunset_adjusted  # Next sunset
+            return sun_times.get("sunrise") + timedelta(minutes=self.coordinator.morning_ramp)  # End of morning ramp
         
         return None
 
@@ -152,6 +220,15 @@ class LumaFlowNextTransitionSensor(CoordinatorEntity[LumaFlowCoordinator], Senso
                 "sunset_adjusted": data.get("sunset_adjusted"),
             })
         
+        # Preview of the values the group will have at the transition
+        next_transition = self.native_value
+        if next_transition is not None:
+            lighting_values = self.coordinator.lighting_values_at(next_transition)
+            attributes.update({
+                "next_brightness": lighting_values["brightness"],
+                "next_color_temp": lighting_values["color_temp"],
+            })
+        
         return attributes
 
     @property
@@ -162,4 +239,98 @@ class LumaFlowNextTransitionSensor(CoordinatorEntity[LumaFlowCoordinator], Senso
             "name": f"LumaFlow {self._group_name.title()}",
             "manufacturer": "LumaFlow",
             "entry_type": "service",
-        } 
\ No newline at end of file
+        }
+
+
+class LumaFlowMetricSensor(SensorEntity):
+    """Diagnostic sensor for one runtime metric of a group.
+
+    The state is written when the group records new samples, at most once
+    every METRICS_WRITE_INTERVAL seconds, rather than polled.
+    """
+
+    entity_description: LumaFlowMetricSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: LumaFlowCoordinator,
+        config_entry: ConfigEntry,
+        description: LumaFlowMetricSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._metrics = coordinator.metrics
+        self._config_entry = config_entry
+        self._group_name = coordinator.group_name
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_name = f"LumaFlow {self._group_name.title()} {description.name}"
+        self._last_write = 0.0
+        self._write_at: Optional[float] = None
+        self._unsub_write: Optional[CALLBACK_TYPE] = None
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state whenever the group records new samples."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._metrics.async_add_listener(self._async_metrics_updated))
+        self.async_on_remove(self._async_cancel_write)
+
+    @callback
+    def _async_metrics_updated(self) -> None:
+        """Schedule a state write, no sooner than the write interval allows."""
+        self._async_schedule_write(self._last_write + METRICS_WRITE_INTERVAL - time.monotonic())
+
+    @callback
+    def _async_schedule_write(self, delay: float) -> None:
+        """Write the state after a delay, unless a write is already due sooner."""
+        delay = max(0.0, delay)
+        write_at = time.monotonic() + delay
+        if self._unsub_write is not None:
+            if self._write_at <= write_at:
+                return
+            self._unsub_write()
+        self._write_at = write_at
+        self._unsub_write = async_call_later(self.hass, delay, self._async_write_metric)
+
+    @callback
+    def _async_write_metric(self, _now: datetime) -> None:
+        """Write the current metric value."""
+        self._unsub_write = None
+        self._last_write = time.monotonic()
+        self.async_write_ha_state()
+        # Rates fall back to zero without new commands, so keep refreshing them until they do
+        if self.entity_description.refresh_interval and self.native_value:
+            self._async_schedule_write(self.entity_description.refresh_interval)
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Cancel a scheduled state write."""
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the metric value."""
+        value = self.entity_description.value_fn(self._metrics)
+        return round(value, 2) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return extra state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return {}
+        return self.entity_description.attributes_fn(self._metrics)
+
+    @property
+    def device_info(self) -> Dict[str, Any]:
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, f"{self._config_entry.entry_id}_{self._group_name}")},
+            "name": f"LumaFlow {self._group_name.title()}",
+            "manufacturer": "LumaFlow",
+            "entry_type": "service",
+        }
@@ -1,14 +1,19 @@
 """Services for LumaFlow integration."""
 
 import logging
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    DATA_ENTITIES,
+    DATA_PENDING,
+    DATA_THROTTLE,
+    DATA_TRACKER,
     DOMAIN,
+    PRIORITY_USER,
     SERVICE_ENABLE,
     SERVICE_DISABLE,
     SERVICE_RESTORE_LIGHTS,
@@ -18,6 +23,13 @@ from .const import (
     ATTR_COLOR_TEMP,
     ATTR_RGB_COLOR,
 )
+from .coordinator import LumaFlowCoordinator, async_get_coordinators
+from .pending import PendingCommands
+from .throttle import CommandThrottle
+from .tracker import LumaFlowStateTracker
+
+if TYPE_CHECKING:
+    from .light import LumaFlowLight
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +50,26 @@ OVERRIDE_LIGHTS_SERVICE_SCHEMA = vol.Schema({
 })
 
 
+def _get_entities(hass: HomeAssistant) -> Dict[str, "LumaFlowLight"]:
+    """Return live LumaFlow light entities keyed by entity_id."""
+    return hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {})
+
+
+def _get_tracker(hass: HomeAssistant) -> Optional[LumaFlowStateTracker]:
+    """Return the domain-wide state tracker, if any entry is loaded."""
+    return hass.data.get(DOMAIN, {}).get(DATA_TRACKER)
+
+
+def _get_throttle(hass: HomeAssistant) -> Optional[CommandThrottle]:
+    """Return the domain-wide command throttle, if any entry is loaded."""
+    return hass.data.get(DOMAIN, {}).get(DATA_THROTTLE)
+
+
+def _get_pending(hass: HomeAssistant) -> Optional[PendingCommands]:
+    """Return the domain-wide pending command slots, if any entry is loaded."""
+    return hass.data.get(DOMAIN, {}).get(DATA_PENDING)
+
+
 def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for LumaFlow."""
     
@@ -46,14 +78,12 @@ def async_setup_services(hass: HomeAssistant) -> None:
         _LOGGER.debug("Enable service called")
         
         # Enable all LumaFlow light entities
-        for entity_id in hass.states.async_entity_ids("light"):
-            if "_lumaflow" in entity_id:
-                state = hass.states.get(entity_id)
-                if state and hasattr(state, 'enable_circadian'):
-                    await hass.async_add_executor_job(state.enable_circadian)
+        for entity in _get_entities(hass).values():
+            entity.enable_circadian()
+            entity.async_write_ha_state()
         
         # Also enable all coordinators
-        for config_entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        for coordinator in async_get_coordinators(hass):
             await coordinator.async_request_refresh()
     
     async def async_disable_service(call: ServiceCall) -> None:
@@ -61,32 +91,42 @@ def async_setup_services(hass: HomeAssistant) -> None:
         _LOGGER.debug("Disable service called")
         
         # Disable all LumaFlow light entities
-        for entity_id in hass.states.async_entity_ids("light"):
-            if "_lumaflow" in entity_id:
-                state = hass.states.get(entity_id)
-                if state and hasattr(state, 'disable_circadian'):
-                    await hass.async_add_executor_job(state.disable_circadian)
+        for entity in _get_entities(hass).values():
+            entity.disable_circadian()
+            entity.async_write_ha_state()
     
     async def async_restore_lights_service(call: ServiceCall) -> None:
         """Handle restore lights service call."""
         lights = call.data.get(ATTR_LIGHTS, [])
         _LOGGER.debug("Restore lights service called for: %s", lights)
         
+        entities = _get_entities(hass)
+        tracker = _get_tracker(hass)
+        
         # Restore specified LumaFlow lights or all if none specified
         if not lights:
-            # Restore all LumaFlow light entities
-            lights = [entity_id for entity_id in hass.states.async_entity_ids("light") if "_lumaflow" in entity_id]
+            lights = list(entities)
         
+        # Member lights are restored with one application per group
+        members: Dict[LumaFlowCoordinator, List[str]] = {}
         for light_entity_id in lights:
-            if "_lumaflow" in light_entity_id:
-                # Enable circadian for LumaFlow entities
-                state = hass.states.get(light_entity_id)
-                if state and hasattr(state, 'enable_circadian'):
-                    await hass.async_add_executor_job(state.enable_circadian)
-                    # Turn on with circadian values
-                    await hass.services.async_call(
-                        "light", "turn_on", {"entity_id": light_entity_id}, blocking=True
-                    )
+            entity = entities.get(light_entity_id)
+            if entity is not None:
+                # Enable circadian for LumaFlow entities and turn on with circadian values
+                entity.enable_circadian()
+                entity.async_write_ha_state()
+                await hass.services.async_call(
+                    "light", "turn_on", {"entity_id": light_entity_id}, blocking=True
+                )
+            elif tracker is not None:
+                for coordinator in tracker.groups_for(light_entity_id):
+                    members.setdefault(coordinator, []).append(light_entity_id)
+        
+        # Clear their overrides and bring them back in line
+        for coordinator, light_ids in members.items():
+            coordinator.async_clear_overrides(light_ids)
+            if coordinator.light_entity is not None:
+                await coordinator.light_entity.async_apply_circadian(light_ids, PRIORITY_USER)
     
     async def async_override_lights_service(call: ServiceCall) -> None:
         """Handle override lights service call."""
@@ -97,6 +137,11 @@ def async_setup_services(hass: HomeAssistant) -> None:
         
         _LOGGER.debug("Override lights service called for: %s", lights)
         
+        entities = _get_entities(hass)
+        tracker = _get_tracker(hass)
+        throttle = _get_throttle(hass)
+        pending = _get_pending(hass)
+        
         # Apply override to specified lights
         for light_entity_id in lights:
             service_data = {"entity_id": light_entity_id}
@@ -104,21 +149,40 @@ def async_setup_services(hass: HomeAssistant) -> None:
             if brightness is not None:
                 service_data["brightness_pct"] = brightness
             if color_temp is not None:
-                service_data["color_temp"] = color_temp
+                service_data["color_temp_kelvin"] = color_temp
             if rgb_color is not None:
                 service_data["rgb_color"] = rgb_color
             
             try:
-                # Turn on light with override settings
-                await hass.services.async_call(
-                    "light", "turn_on", service_data, blocking=True
-                )
+                entity = entities.get(light_entity_id)
+                if entity is not None:
+                    # LumaFlow entities queue the commands to their members themselves
+                    await hass.services.async_call(
+                        "light", "turn_on", service_data, blocking=True
+                    )
+                    entity.set_override(True)
+                    entity.async_write_ha_state()
+                    continue
+                
+                # Mark the owning groups first so their background updates skip the light
+                if tracker is not None:
+                    for coordinator in tracker.groups_for(light_entity_id):
+                        coordinator.async_set_overrides([light_entity_id])
+                
+                if pending is None or throttle is None:
+                    await hass.services.async_call(
+                        "light", "turn_on", service_data, blocking=True
+                    )
+                    continue
                 
-                # If it's a LumaFlow entity, mark as overridden
-                if "_lumaflow" in light_entity_id:
-                    state = hass.states.get(light_entity_id)
-                    if state and hasattr(state, 'set_override'):
-                        await hass.async_add_executor_job(state.set_override, True)
+                # Replaces any circadian update still queued for the light
+                async with pending.async_slot(
+                    [light_entity_id], PRIORITY_USER, throttle, throttle.platform_for(light_entity_id)
+                ) as send_to:
+                    if send_to:
+                        await hass.services.async_call(
+                            "light", "turn_on", service_data, blocking=True
+                        )
                         
             except Exception as err:
                 _LOGGER.error("Failed to override light %s: %s", light_entity_id, err)
@@ -158,4 +222,4 @@ def async_unload_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_ENABLE)
     hass.services.async_remove(DOMAIN, SERVICE_DISABLE)
     hass.services.async_remove(DOMAIN, SERVICE_RESTORE_LIGHTS)
-    hass.services.async_remove(DOMAIN, SERVICE_OVERRIDE_LIGHTS) 
\ No newline at end of file
+    hass.services.async_remove(DOMAIN, SERVICE_OVERRIDE_LIGHTS)
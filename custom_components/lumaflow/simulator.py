@@ -0,0 +1,250 @@
+"""Offline simulation of LumaFlow schedules.
+
+Runs the same solar and curve calculations as a live group over a long
+period, without Home Assistant, to check a configuration for any location
+and to measure how many commands it would send. Run it with::
+
+    python -m custom_components.lumaflow.simulator --latitude 69.65 --longitude 18.96 --time-zone Europe/Oslo
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .const import (
+    DEFAULT_BRIGHTNESS_THRESHOLD,
+    DEFAULT_COLOR_TEMP_THRESHOLD,
+    DEFAULT_CURVE_SHAPE,
+    DEFAULT_MAX_BRIGHTNESS,
+    DEFAULT_MAX_COLOR_TEMP,
+    DEFAULT_MIN_BRIGHTNESS,
+    DEFAULT_MIN_COLOR_TEMP,
+    DEFAULT_MORNING_RAMP,
+    DEFAULT_SUNSET_OFFSET,
+    POLAR_DAY,
+    POLAR_NIGHT,
+)
+from .curves import PHASE_CODES, CompiledCurve, sample_lighting, sample_phases
+from .solar import get_sun_times, sun_event_arrays
+
+# The live curve is sampled once a minute, so the simulation is too
+SIMULATION_STEP_SECONDS = 60
+
+
+@dataclass
+class SimulationResult:
+    """Per-minute timeline of a simulated group and its command estimates."""
+
+    timestamps: np.ndarray
+    phases: np.ndarray
+    brightness: np.ndarray
+    color_temp: np.ndarray
+    polar_days: Dict[str, int]
+    updates: int
+    commands_per_light: int
+    light_count: int
+    elapsed: float
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def minutes(self) -> int:
+        """Return the number of simulated minutes."""
+        return len(self.timestamps)
+
+    @property
+    def commands(self) -> int:
+        """Return the estimated number of light service calls."""
+        return self.commands_per_light * self.light_count
+
+    def phase_minutes(self) -> Dict[str, int]:
+        """Return the number of minutes spent in each phase."""
+        counts = np.bincount(self.phases, minlength=len(PHASE_CODES))
+        return {phase: int(count) for phase, count in zip(PHASE_CODES, counts)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the totals of the simulation."""
+        days = self.minutes / 1440
+        return {
+            **self.settings,
+            "minutes": self.minutes,
+            "phase_minutes": self.phase_minutes(),
+            "polar_days": self.polar_days,
+            "updates": self.updates,
+            "commands": self.commands,
+            "commands_per_light_per_day": round(self.commands_per_light / days, 1) if days else 0,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "minutes_per_second": round(self.minutes / self.elapsed) if self.elapsed else None,
+        }
+
+    def save(self, path: str) -> None:
+        """Write the timeline to a compressed NumPy archive."""
+        np.savez_compressed(
+            path,
+            timestamps=self.timestamps,
+            phases=self.phases,
+            brightness=self.brightness,
+            color_temp=self.color_temp,
+            phase_names=np.array(PHASE_CODES),
+        )
+
+
+def simulate(
+    latitude: float,
+    longitude: float,
+    time_zone: str,
+    start: date,
+    days: int = 365,
+    *,
+    sunset_offset: int = DEFAULT_SUNSET_OFFSET,
+    brightness_range: Tuple[int, int] = (DEFAULT_MIN_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS),
+    color_temp_range: Tuple[int, int] = (DEFAULT_MIN_COLOR_TEMP, DEFAULT_MAX_COLOR_TEMP),
+    curve_shape: str = DEFAULT_CURVE_SHAPE,
+    curve_keyframes: Optional[str] = None,
+    morning_ramp: int = DEFAULT_MORNING_RAMP,
+    brightness_threshold: int = DEFAULT_BRIGHTNESS_THRESHOLD,
+    color_temp_threshold: int = DEFAULT_COLOR_TEMP_THRESHOLD,
+    light_count: int = 1,
+) -> SimulationResult:
+    """Simulate a group from local midnight of a date for a number of days.
+
+    Raises:
+        ValueError: If the curve shape or keyframes are invalid.
+    """
+    started = time.perf_counter()
+    curve = CompiledCurve.compile(curve_shape, curve_keyframes)
+    first = datetime.combine(start, datetime.min.time(), tzinfo=ZoneInfo(time_zone)).timestamp()
+    timestamps = np.arange(int(first), int(first) + days * 86400, SIMULATION_STEP_SECONDS, dtype=np.int64)
+
+    sunrises, sunsets = sun_event_arrays(latitude, longitude, timestamps)
+    since_sunrise = timestamps - sunrises
+    since_sunset = timestamps - (sunsets + sunset_offset * 60)
+    brightness, color_temp = sample_lighting(
+        since_sunrise, since_sunset, brightness_range, color_temp_range, morning_ramp * 60, curve
+    )
+    phases = sample_phases(since_sunrise, since_sunset, morning_ramp * 60)
+
+    # Lights receive the truncated values the coordinator reports
+    brightness = np.trunc(brightness).astype(np.uint8)
+    color_temp = np.trunc(color_temp).astype(np.uint16)
+
+    updates, commands = _estimate_commands(
+        phases, brightness, color_temp, brightness_threshold, color_temp_threshold
+    )
+    return SimulationResult(
+        timestamps=timestamps,
+        phases=phases,
+        brightness=brightness,
+        color_temp=color_temp,
+        polar_days=_count_polar_days(latitude, longitude, timestamps),
+        updates=updates,
+        commands_per_light=commands,
+        light_count=light_count,
+        elapsed=time.perf_counter() - started,
+        settings={
+            "latitude": latitude,
+            "longitude": longitude,
+            "time_zone": time_zone,
+            "start": start.isoformat(),
+            "days": days,
+            "curve_shape": curve_shape,
+            "morning_ramp": morning_ramp,
+            "light_count": light_count,
+        },
+    )
+
+
+def _estimate_commands(
+    phases: np.ndarray,
+    brightness: np.ndarray,
+    color_temp: np.ndarray,
+    brightness_threshold: int,
+    color_temp_threshold: int,
+) -> Tuple[int, int]:
+    """Return the coordinator updates and per-light commands over a timeline.
+
+    Updates are the minutes where the reported phase or values change.
+    Commands follow the light entity's change thresholds, which always let
+    the last values of a phase through.
+    """
+    if not len(phases):
+        return 0, 0
+    changed = np.flatnonzero(
+        (np.diff(phases) != 0) | (np.diff(brightness) != 0) | (np.diff(color_temp) != 0)
+    ) + 1
+
+    # The first sample is applied unconditionally
+    commands = 1
+    last_phase, last_brightness, last_color_temp = int(phases[0]), int(brightness[0]), int(color_temp[0])
+    for phase, new_brightness, new_color_temp in zip(
+        phases[changed].tolist(),
+        brightness[changed].tolist(),
+        color_temp[changed].tolist(),
+    ):
+        if phase != last_phase:
+            apply = new_brightness != last_brightness or new_color_temp != last_color_temp
+        else:
+            apply = (
+                abs(new_brightness - last_brightness) >= brightness_threshold
+                or abs(new_color_temp - last_color_temp) >= color_temp_threshold
+            )
+        if apply:
+            commands += 1
+            last_phase, last_brightness, last_color_temp = phase, new_brightness, new_color_temp
+    return len(changed), commands
+
+
+def _count_polar_days(latitude: float, longitude: float, timestamps: np.ndarray) -> Dict[str, int]:
+    """Return how many simulated solar dates have no sunrise or sunset."""
+    counts = {POLAR_DAY: 0, POLAR_NIGHT: 0}
+    for epoch_day in np.unique(timestamps // 86400).tolist():
+        polar = get_sun_times(latitude, longitude, date(1970, 1, 1) + timedelta(days=epoch_day))["polar"]
+        if polar is not None:
+            counts[polar] += 1
+    return counts
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Run a simulation from the command line and print its summary as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latitude", type=float, required=True)
+    parser.add_argument("--longitude", type=float, required=True)
+    parser.add_argument("--time-zone", default="UTC")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(date.today().year, 1, 1))
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sunset-offset", type=int, default=DEFAULT_SUNSET_OFFSET)
+    parser.add_argument("--curve-shape", default=DEFAULT_CURVE_SHAPE)
+    parser.add_argument("--curve-keyframes")
+    parser.add_argument("--morning-ramp", type=int, default=DEFAULT_MORNING_RAMP)
+    parser.add_argument("--lights", type=int, default=1)
+    parser.add_argument("--output", help="write the per-minute timeline to this .npz file")
+    args = parser.parse_args(argv)
+
+    try:
+        result = simulate(
+            args.latitude,
+            args.longitude,
+            args.time_zone,
+            args.start,
+            args.days,
+            sunset_offset=args.sunset_offset,
+            curve_shape=args.curve_shape,
+            curve_keyframes=args.curve_keyframes,
+            morning_ramp=args.morning_ramp,
+            light_count=args.lights,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.output:
+        result.save(args.output)
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
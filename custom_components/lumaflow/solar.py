@@ -0,0 +1,111 @@
+"""Shared solar schedule cache for LumaFlow coordinators."""
+
+import logging
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from astral import Observer
+from astral.sun import elevation, noon, sunrise, sunset
+
+from .const import (
+    POLAR_DAY,
+    POLAR_DAY_LENGTH_HOURS,
+    POLAR_NIGHT,
+    SOLAR_CACHE_DAYS_AHEAD,
+    SOLAR_CACHE_MAX_ENTRIES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sun times shared by every coordinator, keyed by (latitude, longitude, date).
+# All config entries use the same hass.config location, so the astronomy math
+# runs once per location per day instead of once per group per update. The
+# cache is bounded by size, so lookups of other dates, e.g. a simulation or
+# a preview, cannot evict the days the coordinators keep using.
+_SOLAR_CACHE: "OrderedDict[Tuple[float, float, date], Dict[str, Any]]" = OrderedDict()
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def get_sun_times(latitude: float, longitude: float, day: date) -> Dict[str, Any]:
+    """Return the cached sun times for a location and date.
+
+    On a cache miss the schedule is computed for the requested day and the
+    following days, and the least recently used days are evicted once the
+    cache is full. The returned dict is shared between callers and must not
+    be modified.
+
+    On days when the sun does not rise or set, ``polar`` is set to
+    POLAR_DAY or POLAR_NIGHT and sunrise/sunset are placed symmetrically
+    around solar noon, so the phases and curves keep a usable shape.
+    """
+    key = (latitude, longitude, day)
+    sun_times = _SOLAR_CACHE.get(key)
+    if sun_times is not None:
+        _SOLAR_CACHE.move_to_end(key)
+        return sun_times
+
+    observer = Observer(latitude=latitude, longitude=longitude)
+    sun_times = _compute_sun_times(observer, day)
+    _SOLAR_CACHE[key] = sun_times
+
+    # Precompute the following days while we are at it
+    for offset in range(1, SOLAR_CACHE_DAYS_AHEAD):
+        cache_day = day + timedelta(days=offset)
+        cache_key = (latitude, longitude, cache_day)
+        if cache_key not in _SOLAR_CACHE:
+            _SOLAR_CACHE[cache_key] = _compute_sun_times(observer, cache_day)
+    _SOLAR_CACHE.move_to_end(key)
+    _evict_least_recent()
+
+    _LOGGER.debug(
+        "Computed solar schedule for lat=%s, lon=%s starting %s",
+        latitude, longitude, day
+    )
+    return sun_times
+
+
+def sun_event_arrays(
+    latitude: float, longitude: float, timestamps: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return sunrise and sunset timestamps for the solar (UTC) date of each timestamp."""
+    days, day_index = np.unique(timestamps // 86400, return_inverse=True)
+    events = np.array([
+        (sun_times["sunrise"].timestamp(), sun_times["sunset"].timestamp())
+        for sun_times in (
+            get_sun_times(latitude, longitude, _EPOCH_DATE + timedelta(days=int(epoch_day)))
+            for epoch_day in days
+        )
+    ])
+    return events[day_index, 0], events[day_index, 1]
+
+
+def _compute_sun_times(observer: Observer, day: date) -> Dict[str, Any]:
+    """Compute sunrise, noon and sunset, falling back to a nominal day near the poles."""
+    solar_noon = noon(observer, day)
+    try:
+        return {
+            "sunrise": sunrise(observer, day),
+            "noon": solar_noon,
+            "sunset": sunset(observer, day),
+            "polar": None,
+        }
+    except ValueError:
+        # The sun stays above or below the horizon all day
+        polar = POLAR_DAY if elevation(observer, solar_noon) > 0 else POLAR_NIGHT
+        half_day = timedelta(hours=POLAR_DAY_LENGTH_HOURS / 2)
+        _LOGGER.debug("No sunrise or sunset on %s (%s), centering a nominal day on noon", day, polar)
+        return {
+            "sunrise": solar_noon - half_day,
+            "noon": solar_noon,
+            "sunset": solar_noon + half_day,
+            "polar": polar,
+        }
+
+
+def _evict_least_recent() -> None:
+    """Drop the least recently used schedules beyond the cache size."""
+    while len(_SOLAR_CACHE) > SOLAR_CACHE_MAX_ENTRIES:
+        _SOLAR_CACHE.popitem(last=False)
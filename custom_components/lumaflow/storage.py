@@ -0,0 +1,65 @@
+"""Domain-wide persistence of LumaFlow runtime state across restarts."""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import STORAGE_KEY, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LumaFlowStore:
+    """Runtime state of every group, kept in a single storage file.
+
+    The file is read once, however many groups are set up at the same
+    time. Changes only update memory and schedule a delayed write, so a
+    burst of toggles across groups ends up as one write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._load_task: Optional[asyncio.Task] = None
+
+    async def async_load(self) -> None:
+        """Read the stored state, once for all groups."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_read())
+        await self._load_task
+
+    async def _async_read(self) -> None:
+        """Read the storage file into memory."""
+        data = await self._store.async_load()
+        if data:
+            self._groups = dict(data.get("groups", {}))
+        _LOGGER.debug("Loaded stored state of %d LumaFlow groups", len(self._groups))
+
+    def get(self, entry_id: str) -> Dict[str, Any]:
+        """Return the stored state of a group, empty if there is none."""
+        return self._groups.get(entry_id, {})
+
+    @callback
+    def async_set(self, entry_id: str, state: Dict[str, Any]) -> None:
+        """Replace the state of a group and schedule a batched write."""
+        self._groups[entry_id] = state
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the state of a removed group."""
+        if self._groups.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the state now instead of waiting for a scheduled write."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to write."""
+        return {"groups": self._groups}
@@ -54,14 +54,11 @@ class LumaFlowLightSwitch(CoordinatorEntity[LumaFlowCoordinator], SwitchEntity):
         self._attr_unique_id = f"{config_entry.entry_id}_{light_entity_id.replace('.', '_')}_enabled"
         self._attr_name = f"{light_friendly_name} (LumaFlow)"
         self._attr_icon = "mdi:lightbulb"
-        
-        # Default to enabled
-        self._enabled = True
 
     @property
     def is_on(self) -> bool:
         """Return true if light is enabled in LumaFlow group."""
-        return self._enabled
+        return self._light_entity_id in self.coordinator.enabled_lights
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
@@ -84,13 +81,15 @@ class LumaFlowLightSwitch(CoordinatorEntity[LumaFlowCoordinator], SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable this light in the LumaFlow group."""
-        self._enabled = True
+        self.coordinator.enabled_lights.add(self._light_entity_id)
+        self.coordinator.async_save_state()
         self.async_write_ha_state()
         _LOGGER.info("Enabled %s in LumaFlow group %s", self._light_entity_id, self._group_name)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable this light in the LumaFlow group."""
-        self._enabled = False
+        self.coordinator.enabled_lights.discard(self._light_entity_id)
+        self.coordinator.async_save_state()
         self.async_write_ha_state()
         _LOGGER.info("Disabled %s in LumaFlow group %s", self._light_entity_id, self._group_name)
 
@@ -102,4 +101,4 @@ class LumaFlowLightSwitch(CoordinatorEntity[LumaFlowCoordinator], SwitchEntity):
             "name": f"LumaFlow {self._group_name.title()}",
             "manufacturer": "LumaFlow",
             "entry_type": "service",
-        } 
\ No newline at end of file
+        }
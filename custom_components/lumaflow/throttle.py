@@ -0,0 +1,140 @@
+"""Domain-wide rate limiting of light commands sent by LumaFlow."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    COMMAND_BURST_SECONDS,
+    DEFAULT_COMMAND_RATE,
+    PLATFORM_COMMAND_RATES,
+    PRIORITY_BACKGROUND,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rate limit key for lights whose integration is unknown
+UNKNOWN_PLATFORM = "unknown"
+
+
+class TokenBucket:
+    """Commands per second for one integration, with a bounded burst."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: int) -> float:
+        """Take tokens for a command, returning 0 or the seconds until it can go.
+
+        A command larger than the burst goes out once the bucket is full and
+        leaves the bucket in debt, so large batches are never starved.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        needed = min(cost, self.burst)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class CommandThrottle:
+    """Bound the light commands per second sent to each integration.
+
+    Commands wait in a priority queue per integration, so commands a user
+    is waiting for go ahead of background circadian refreshes to the same
+    bridge or radio network.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the throttle."""
+        self.hass = hass
+        self._platforms: Dict[str, str] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiters: Dict[str, List[Tuple[int, int, int, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._sequence = itertools.count()
+
+    def platform_for(self, entity_id: str) -> str:
+        """Return the integration providing an entity, which its commands are limited by."""
+        platform = self._platforms.get(entity_id)
+        if platform is None:
+            entry = er.async_get(self.hass).async_get(entity_id)
+            platform = entry.platform if entry is not None else UNKNOWN_PLATFORM
+            self._platforms[entity_id] = platform
+        return platform
+
+    async def async_acquire(self, platform: str, cost: int = 1, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Wait until commands to a number of lights may be sent to an integration."""
+        bucket = self._bucket(platform)
+        waiters = self._waiters.setdefault(platform, [])
+        if not waiters and not bucket.take(cost):
+            return
+
+        future = self.hass.loop.create_future()
+        heapq.heappush(waiters, (priority, next(self._sequence), cost, future))
+        self._async_release(platform)
+        await future
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel pending timers and waiting commands."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for waiters in self._waiters.values():
+            for *_, future in waiters:
+                future.cancel()
+        self._waiters.clear()
+
+    def _bucket(self, platform: str) -> TokenBucket:
+        """Return the token bucket of an integration."""
+        bucket = self._buckets.get(platform)
+        if bucket is None:
+            rate = PLATFORM_COMMAND_RATES.get(platform, DEFAULT_COMMAND_RATE)
+            bucket = self._buckets[platform] = TokenBucket(rate, rate * COMMAND_BURST_SECONDS)
+        return bucket
+
+    @callback
+    def _async_release(self, platform: str) -> None:
+        """Let waiting commands through in priority order while tokens last."""
+        self._timers.pop(platform, None)
+        waiters = self._waiters[platform]
+        bucket = self._buckets[platform]
+        while waiters:
+            _, _, cost, future = waiters[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(waiters)
+                continue
+            delay = bucket.take(cost)
+            if delay:
+                self._async_schedule_release(platform, delay)
+                return
+            heapq.heappop(waiters)
+            future.set_result(None)
+
+    @callback
+    def _async_schedule_release(self, platform: str, delay: float) -> None:
+        """Wake up once the next waiting command can go."""
+        timer: Optional[asyncio.TimerHandle] = self._timers.get(platform)
+        if timer is not None:
+            timer.cancel()
+        self._timers[platform] = self.hass.loop.call_later(delay, self._async_release, platform)
+        _LOGGER.debug(
+            "Throttling %d commands to %s for %.2fs", len(self._waiters[platform]), platform, delay
+        )
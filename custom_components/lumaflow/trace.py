@@ -0,0 +1,148 @@
+"""Bounded trace of the light commands sent by a LumaFlow group."""
+
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ulid import bytes_to_ulid, ulid_to_bytes
+
+from .const import PRIORITY_BACKGROUND, PRIORITY_USER, TRACE_CAPACITY, TRACE_PAYLOADS
+
+# What happened to a traced command
+OUTCOME_SENT = 0
+OUTCOME_FAILED = 1
+OUTCOME_SUPPRESSED = 2
+OUTCOME_SUPERSEDED = 3
+OUTCOME_SKIPPED = 4
+_OUTCOMES = ("sent", "failed", "suppressed", "superseded", "skipped")
+
+_SERVICES = ("turn_on", "turn_off")
+
+# One command to one light
+TRACE_DTYPE = np.dtype([
+    ("time", "f8"),  # Unix timestamp
+    ("light", "u2"),  # index into the traced lights
+    ("service", "u1"),
+    ("outcome", "u1"),
+    ("priority", "u1"),
+    ("payload", "u4"),  # CRC-32 of the service data
+    ("latency", "f4"),  # milliseconds, NaN if not sent
+    ("context", "u1", 16),  # originating context id, as ULID bytes
+])
+
+
+def payload_hash(data: Dict[str, Any]) -> int:
+    """Return a hash of service data that is stable across restarts."""
+    return zlib.crc32(repr(sorted(data.items())).encode())
+
+
+def _context_bytes(context_id: Optional[str]) -> np.ndarray:
+    """Pack a context id into 16 bytes, all zero if it is not a ULID."""
+    if context_id:
+        try:
+            return np.frombuffer(ulid_to_bytes(context_id), np.uint8)
+        except ValueError:
+            pass
+    return np.zeros(16, np.uint8)
+
+
+class CommandTrace:
+    """The most recent light commands of a group, in a fixed-size array.
+
+    The array is allocated once and overwritten as a ring, so the trace
+    uses the same memory however long Home Assistant runs. Payloads are
+    kept as hashes, with the last few distinct payloads available to look
+    the hashes up.
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY) -> None:
+        """Initialize an empty trace."""
+        self._records = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self._next = 0
+        self.total = 0
+        self._lights: List[str] = []
+        self._light_index: Dict[str, int] = {}
+        self._payloads: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+    def record(
+        self,
+        service: str,
+        light_ids: List[str],
+        outcome: int,
+        data: Optional[Dict[str, Any]] = None,
+        latency: Optional[float] = None,
+        priority: int = PRIORITY_BACKGROUND,
+        context_id: Optional[str] = None,
+    ) -> None:
+        """Record one command to a number of lights.
+
+        Args:
+            service: Light service name, e.g. ``turn_on``.
+            light_ids: Lights the command was for.
+            outcome: One of the OUTCOME_* codes.
+            data: Service data of the command, without entity_id.
+            latency: Seconds the service call took, if it was sent.
+            priority: Priority the command was dispatched with.
+            context_id: Id of the context the command originated from.
+        """
+        capacity = len(self._records)
+        light_ids = light_ids[-capacity:]
+        count = len(light_ids)
+        if not count:
+            return
+
+        payload = 0
+        if data is not None:
+            payload = payload_hash(data)
+            self._payloads[payload] = data
+            self._payloads.move_to_end(payload)
+            if len(self._payloads) > TRACE_PAYLOADS:
+                self._payloads.popitem(last=False)
+
+        slots = (self._next + np.arange(count)) % capacity
+        records = self._records
+        records["time"][slots] = time.time()
+        records["light"][slots] = [self._index(light_id) for light_id in light_ids]
+        records["service"][slots] = _SERVICES.index(service) if service in _SERVICES else len(_SERVICES)
+        records["outcome"][slots] = outcome
+        records["priority"][slots] = priority
+        records["payload"][slots] = payload
+        records["latency"][slots] = np.nan if latency is None else latency * 1000
+        records["context"][slots] = _context_bytes(context_id)
+        self._next = (self._next + count) % capacity
+        self.total += count
+
+    def _index(self, light_id: str) -> int:
+        """Return the index a light is stored under."""
+        index = self._light_index.get(light_id)
+        if index is None:
+            index = self._light_index[light_id] = len(self._lights)
+            self._lights.append(light_id)
+        return index
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the traced commands, oldest first, for diagnostics."""
+        capacity = len(self._records)
+        count = min(self.total, capacity)
+        records = self._records[(self._next - count + np.arange(count)) % capacity]
+        return {
+            "capacity": capacity,
+            "total": self.total,
+            "commands": [
+                {
+                    "time": dt_util.utc_from_timestamp(float(record["time"])).isoformat(),
+                    "light": self._lights[record["light"]],
+                    "service": _SERVICES[record["service"]] if record["service"] < len(_SERVICES) else None,
+                    "outcome": _OUTCOMES[record["outcome"]],
+                    "priority": "user" if record["priority"] == PRIORITY_USER else "background",
+                    "payload": f"{int(record['payload']):08x}" if record["payload"] else None,
+                    "latency_ms": None if np.isnan(record["latency"]) else round(float(record["latency"]), 1),
+                    "context": bytes_to_ulid(record["context"].tobytes()) if record["context"].any() else None,
+                }
+                for record in records
+            ],
+            "payloads": {f"{payload:08x}": data for payload, data in self._payloads.items()},
+        }
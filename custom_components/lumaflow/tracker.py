@@ -0,0 +1,73 @@
+"""Domain-wide state tracking for lights controlled by LumaFlow."""
+
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+if TYPE_CHECKING:
+    from .coordinator import LumaFlowCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LumaFlowStateTracker:
+    """Route member light state changes to the groups that control them.
+
+    A single state_changed subscription covers every controlled light of
+    every LumaFlow group, and an index from light entity_id to its groups
+    makes routing each event an O(1) lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._index: Dict[str, List["LumaFlowCoordinator"]] = {}
+        self._unsub: Optional[Callable[[], None]] = None
+
+    def groups_for(self, light_id: str) -> List["LumaFlowCoordinator"]:
+        """Return the groups controlling a light."""
+        return self._index.get(light_id, [])
+
+    @callback
+    def async_add_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Start tracking the lights of a group."""
+        for light_id in coordinator.controlled_lights:
+            self._index.setdefault(light_id, []).append(coordinator)
+        coordinator.async_sync_light_states()
+        self._async_subscribe()
+
+    @callback
+    def async_remove_group(self, coordinator: "LumaFlowCoordinator") -> None:
+        """Stop tracking the lights of a group."""
+        for light_id in coordinator.controlled_lights:
+            groups = self._index.get(light_id)
+            if groups and coordinator in groups:
+                groups.remove(coordinator)
+                if not groups:
+                    del self._index[light_id]
+        self._async_subscribe()
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop the state change subscription."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_subscribe(self) -> None:
+        """Replace the subscription to cover the current set of lights."""
+        self.async_stop()
+        if self._index:
+            self._unsub = async_track_state_change_event(
+                self.hass, list(self._index), self._async_state_changed
+            )
+        _LOGGER.debug("Tracking %d lights across LumaFlow groups", len(self._index))
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Forward a member light state change to its groups."""
+        for coordinator in self._index.get(event.data["entity_id"], ()):
+            coordinator.async_handle_light_state(event)